@@ -1,14 +1,52 @@
 """Geli — Multi-Media Rating App (Flask application)."""
 import json
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+import math
+import mimetypes
+import os
+import secrets
+import threading
+from collections import OrderedDict
+import click
+from flask import (Flask, Response, render_template, request, jsonify, session, redirect, url_for,
+                   make_response, send_from_directory)
+from itsdangerous import BadSignature
+from werkzeug.security import check_password_hash, generate_password_hash
 from igdb_client import IGDBClient
 from openlibrary_client import OpenLibraryClient
 from tmdb_client import TMDBClient
+import assets
+import exporter
+import importer
 import models
+import provider_backend
 import ranking
 
+SECRET_KEY_PATH = os.path.join(os.path.dirname(__file__), "secret_key")
+
+
+def _load_secret_key():
+    """GELI_SECRET_KEY if set, else a random key generated on first run and
+    kept in SECRET_KEY_PATH so sessions survive restarts and span workers."""
+    key = os.environ.get("GELI_SECRET_KEY")
+    if key:
+        return key
+    if not os.path.exists(SECRET_KEY_PATH):
+        tmp = f"{SECRET_KEY_PATH}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp, SECRET_KEY_PATH)  # atomic; the first process to start wins
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp)
+    with open(SECRET_KEY_PATH) as f:
+        return f.read().strip()
+
+
 app = Flask(__name__)
-app.secret_key = "geli-secret-key-change-in-production"
+app.secret_key = _load_secret_key()
+app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
 
 VALID_MEDIA_TYPES = {"games", "books", "movies", "tv"}
 
@@ -19,25 +57,206 @@ MEDIA_CONFIG = {
     "tv":     {"label": "TV Shows", "singular": "TV Show",  "emoji": "📺", "search_hint": "Search for a TV show..."},
 }
 
+# ─── Static assets ───────────────────────────────────────────────────────────
+# Fingerprinted copies of static files, built by `flask build-assets`. Until
+# a build exists, templates link the plain static files. The debug reloader
+# only watches .py files, so in debug mode they always do, and edits show up
+# on the next page load.
+_asset_manifest = assets.load_manifest()
+
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@app.template_global()
+def asset_url(name):
+    """URL of the fingerprinted build of a static file (the file itself when debugging)."""
+    hashed = None if app.debug else _asset_manifest.get(name)
+    if hashed is None:
+        return url_for("static", filename=name)
+    return url_for("asset", filename=hashed)
+
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    """Serve a fingerprinted asset, precompressed when the client accepts it."""
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in assets.ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.exists(
+            os.path.join(assets.DIST_DIR, filename + suffix)
+        ):
+            resp = send_from_directory(assets.DIST_DIR, filename + suffix, mimetype=mimetype)
+            resp.headers["Content-Encoding"] = encoding
+            break
+    else:
+        resp = send_from_directory(assets.DIST_DIR, filename, mimetype=mimetype)
+    resp.headers["Cache-Control"] = ASSET_CACHE_CONTROL
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
+
+
+@app.cli.command("build-assets")
+def build_assets_command():
+    """Fingerprint and precompress static assets."""
+    for name, hashed in assets.build_assets().items():
+        click.echo(f"{name} -> {hashed}")
+
+
 # ─── Lazy-init API clients ──────────────────────────────────────────────────
 _clients = {}
 
 
+def _live_client(media_type):
+    if media_type == "games":
+        return IGDBClient("creds.json")
+    if media_type == "books":
+        return OpenLibraryClient()
+    if media_type in ("movies", "tv"):
+        return TMDBClient("creds.json")
+    return None
+
+
 def get_client(media_type):
     """Get or create the appropriate API client for the media type."""
     if media_type not in _clients:
-        if media_type == "games":
-            _clients[media_type] = IGDBClient("creds.json")
-        elif media_type == "books":
-            _clients[media_type] = OpenLibraryClient()
-        elif media_type in ("movies", "tv"):
-            _clients[media_type] = TMDBClient("creds.json")
+        _clients[media_type] = provider_backend.client_for(media_type, _live_client)
     return _clients[media_type]
 
 
+def normalize_results(media_type, results):
+    """Bring provider results to the common item shape used by the rest of the app."""
+    if media_type == "games":
+        # Normalize game results to use external_id
+        for g in results:
+            g["external_id"] = g.pop("igdb_id", g.get("external_id"))
+            # Map platforms → meta_line for consistency
+            if "platforms" in g and "meta_line" not in g:
+                g["meta_line"] = g["platforms"]
+    return results
+
+
+def mark_ranked(media_type, results):
+    """Flag results that are already in the user's rankings."""
+    ranked = models.get_ranked_ids(media_type, [item["external_id"] for item in results])
+    for item in results:
+        item["already_ranked"] = str(item["external_id"]) in ranked
+    return results
+
+
+def search_provider(media_type, q):
+    """Search the provider for a media type, returning normalized result dicts."""
+    client = get_client(media_type)
+    if media_type == "games":
+        results = client.search_games(q)
+    elif media_type == "books":
+        results = client.search_books(q)
+    elif media_type == "movies":
+        results = client.search_movies(q)
+    elif media_type == "tv":
+        results = client.search_tv(q)
+    else:
+        results = []
+    return normalize_results(media_type, results)
+
+
+def resolve_user(session_user):
+    """Map a session's user to the shard it may use, or None if it has to sign in.
+
+    A session only gets a user by passing the passphrase check in switch_user.
+    Sessions without one share the default user's rankings while nobody has
+    claimed them, as in a single-user install.
+    """
+    if session_user is None:
+        return None if models.is_claimed(models.DEFAULT_USER) else models.DEFAULT_USER
+    return session_user if models.valid_username(session_user) else None
+
+
+# Reachable without a user, so a signed-out visitor can sign in.
+PUBLIC_ENDPOINTS = {"switch_user", "static", "asset"}
+
+
 @app.before_request
-def ensure_db():
-    models.init_db()
+def bind_user():
+    """Route this request's database calls to the signed-in user's shard."""
+    user = resolve_user(session.get("user"))
+    # Always set it: worker threads can be reused across requests.
+    models.set_current_user(user or models.DEFAULT_USER)
+    if user is None and request.endpoint not in PUBLIC_ENDPOINTS:
+        if request.method == "GET" and "/api/" not in request.path:
+            return redirect(url_for("switch_user"))
+        return jsonify({"error": "Sign in at /user/ first"}), 401
+
+
+def user_from_session_cookie(cookie_value):
+    """Resolve the user stored in a raw session cookie, for request paths that
+    don't go through Flask (see asgi.py). None means the request must sign in."""
+    serializer = app.session_interface.get_signing_serializer(app)
+    try:
+        data = serializer.loads(cookie_value) if cookie_value else {}
+    except BadSignature:
+        data = {}
+    return resolve_user(data.get("user"))
+
+
+# ─── Conditional GET ─────────────────────────────────────────────────────────
+# Rendered rankings pages, keyed by (user, media type) → (data version, html),
+# least recently used first.
+PAGE_CACHE_SIZE = models.MAX_CACHED_SHARDS * len(VALID_MEDIA_TYPES)
+_page_cache = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+
+def _cached_page(key, version):
+    """Return the cached html for key if it was rendered at version, else None."""
+    with _page_cache_lock:
+        cached = _page_cache.get(key)
+        if cached is None or cached[0] != version:
+            return None
+        _page_cache.move_to_end(key)
+        return cached[1]
+
+
+def _cache_page(key, version, html):
+    with _page_cache_lock:
+        _page_cache[key] = (version, html)
+        _page_cache.move_to_end(key)
+        if len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+
+def _etag_for(media_type, version):
+    """ETag for anything derived from a media type's rankings at a data version."""
+    return f"{media_type}-{version}"
+
+
+def _not_modified(etag):
+    """Return a 304 response if the client already holds this ETag, else None."""
+    if etag in request.if_none_match:
+        resp = make_response("", 304)
+        resp.set_etag(etag)
+        return resp
+    return None
+
+
+def _with_etag(resp, etag):
+    """Attach the ETag and force revalidation on every navigation."""
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+ALL_MEDIA_CONFIG = {"label": "All Media", "singular": "Item", "emoji": "🏆"}
+LEADERBOARD_DEFAULT_LIMIT = 50
+LEADERBOARD_MAX_LIMIT = 500
+
+
+def _leaderboard_etag():
+    versions = ".".join(models.get_data_version(mt) for mt in sorted(VALID_MEDIA_TYPES))
+    return f"all-{versions}"
+
+
+def _leaderboard_limit():
+    limit = request.args.get("limit", LEADERBOARD_DEFAULT_LIMIT, type=int)
+    return max(1, min(limit, LEADERBOARD_MAX_LIMIT))
 
 
 # ─── Root redirect ───────────────────────────────────────────────────────────
@@ -47,6 +266,77 @@ def root():
     return redirect(url_for("index", media_type="games"))
 
 
+@app.template_global()
+def csrf_token():
+    """The session's CSRF token, for hidden form fields."""
+    if "csrf_token" not in session:
+        session["csrf_token"] = secrets.token_urlsafe(32)
+    return session["csrf_token"]
+
+
+def _valid_csrf():
+    expected = session.get("csrf_token")
+    return bool(expected) and secrets.compare_digest(request.form.get("csrf_token", ""), expected)
+
+
+def _user_page(username="", error=None, status=200):
+    html = render_template(
+        "user.html",
+        username=username,
+        error=error,
+        media_type="all",
+        media_config=ALL_MEDIA_CONFIG,
+        all_media=MEDIA_CONFIG,
+    )
+    return html, status
+
+
+@app.route("/user/", methods=["GET", "POST"])
+@app.route("/user/<username>")
+def switch_user(username=""):
+    """Switch to (or claim) a user's rankings.
+
+    The first person to pick a passphrase for a username claims it; after
+    that, switching to it needs the passphrase. The default user needs none
+    until someone claims it (see resolve_user). A rejected attempt never
+    creates a shard.
+    """
+    if request.method == "GET":
+        return _user_page(username)
+    if not _valid_csrf():
+        return jsonify({"error": "Invalid or missing CSRF token"}), 400
+
+    username = request.form.get("username", "").strip()
+    passphrase = request.form.get("passphrase", "")
+    if not models.valid_username(username):
+        return _user_page(username, "Usernames are 1-32 letters, digits, '-' or '_'", 400)
+
+    with models.use_user(username):
+        stored = models.get_passphrase_hash()
+        if stored is None and passphrase:
+            stored = models.claim_user(generate_password_hash(passphrase))
+    if stored is None:
+        if username != models.DEFAULT_USER:
+            return _user_page(username, "Choose a passphrase to claim this username", 400)
+    elif not check_password_hash(stored, passphrase):
+        return _user_page(username, "Wrong passphrase", 403)
+
+    if stored is None:
+        # The unclaimed default user is what signed-out sessions get anyway;
+        # keep it that way so they lose access if it's claimed later.
+        session.pop("user", None)
+    else:
+        session["user"] = username
+    session.pop("compare_state", None)
+    session.pop("csrf_token", None)
+    return redirect(url_for("index", media_type="games"))
+
+
+@app.context_processor
+def inject_user():
+    return {"current_user": models.get_current_user()}
+
+
 # ─── Pages ───────────────────────────────────────────────────────────────────
 
 @app.route("/<media_type>/")
@@ -55,6 +345,19 @@ def index(media_type):
     if media_type not in VALID_MEDIA_TYPES:
         return redirect(url_for("index", media_type="games"))
 
+    # The version is read before the items so a write racing with the render
+    # can only leave the cache holding newer data than its key claims.
+    version = models.get_data_version(media_type)
+    etag = _etag_for(media_type, version)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    cache_key = (models.get_current_user(), media_type)
+    cached = _cached_page(cache_key, version)
+    if cached is not None:
+        return _with_etag(make_response(cached), etag)
+
     items = models.get_all_ranked_items(media_type)
     total = len(items)
     show_scores = total >= 10
@@ -67,7 +370,7 @@ def index(media_type):
 
     config = MEDIA_CONFIG[media_type]
 
-    return render_template(
+    html = render_template(
         "index.html",
         all_items=items,
         liked=liked,
@@ -75,10 +378,45 @@ def index(media_type):
         disliked=disliked,
         total=total,
         show_scores=show_scores,
+        pending_imports=models.count_pending_imports(media_type),
         media_type=media_type,
         media_config=config,
         all_media=MEDIA_CONFIG,
     )
+    _cache_page(cache_key, version, html)
+    return _with_etag(make_response(html), etag)
+
+
+@app.route("/all/")
+def leaderboard():
+    """Global leaderboard — the best-scored items across every media type."""
+    etag = _leaderboard_etag()
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    limit = _leaderboard_limit()
+    items = list(ranking.iter_leaderboard(limit))
+    html = render_template(
+        "leaderboard.html",
+        items=items,
+        limit=limit,
+        media_type="all",
+        media_config=ALL_MEDIA_CONFIG,
+        all_media=MEDIA_CONFIG,
+    )
+    return _with_etag(make_response(html), etag)
+
+
+@app.route("/all/api/leaderboard")
+def api_leaderboard():
+    """Global leaderboard as JSON (?limit=N, default 50)."""
+    etag = _leaderboard_etag()
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+    items = list(ranking.iter_leaderboard(_leaderboard_limit()))
+    return _with_etag(jsonify(items), etag)
 
 
 @app.route("/<media_type>/search")
@@ -111,12 +449,11 @@ def compare_page(media_type):
     low = state["low"]
     high = state["high"]
 
-    mid, target_item = ranking.get_comparison_target(media_type, tier, low, high)
+    mid, target_item = ranking.get_comparison_target(media_type, tier, low, high, state.get("step"))
     state["mid"] = mid
     session["compare_state"] = state
 
     tier_count = models.count_items_in_tier(media_type, tier)
-    import math
     remaining = max(1, int(math.log2(max(high - low + 1, 1))) + 1)
 
     config = MEDIA_CONFIG[media_type]
@@ -147,29 +484,8 @@ def api_search(media_type):
         return jsonify([])
 
     try:
-        client = get_client(media_type)
-        if media_type == "games":
-            results = client.search_games(q)
-            # Normalize game results to use external_id
-            for g in results:
-                g["external_id"] = g.pop("igdb_id", g.get("external_id"))
-                # Map platforms → meta_line for consistency
-                if "platforms" in g and "meta_line" not in g:
-                    g["meta_line"] = g["platforms"]
-        elif media_type == "books":
-            results = client.search_books(q)
-        elif media_type == "movies":
-            results = client.search_movies(q)
-        elif media_type == "tv":
-            results = client.search_tv(q)
-        else:
-            results = []
-
-        # Mark items that are already ranked
-        for item in results:
-            item["already_ranked"] = models.item_exists(media_type, item["external_id"])
-
-        return jsonify(results)
+        results = search_provider(media_type, q)
+        return jsonify(mark_ranked(media_type, results))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -224,12 +540,21 @@ def api_compare(media_type):
     new_low, new_high, insert_pos = ranking.process_comparison(answer, low, high, mid)
 
     if insert_pos is not None:
-        ranking.insert_item(state["item_data"], media_type, state["tier"], insert_pos)
+        if state.get("move_id"):
+            ranking.move_item(media_type, state["move_id"], state["tier"], insert_pos)
+        else:
+            ranking.insert_item(state["item_data"], media_type, state["tier"], insert_pos)
         session.pop("compare_state", None)
+        if state.get("pending_id"):
+            models.delete_pending_import(media_type, state["pending_id"])
+            next_url = _continue_import(media_type)
+            status = "compare" if next_url == url_for("compare_page", media_type=media_type) else "done"
+            return jsonify({"status": status, "redirect": next_url})
         return jsonify({"status": "done", "redirect": url_for("index", media_type=media_type)})
 
     state["low"] = new_low
     state["high"] = new_high
+    state["step"] = ranking.next_gallop_step(answer, state.get("step"))
     session["compare_state"] = state
     return jsonify({"status": "compare", "redirect": url_for("compare_page", media_type=media_type)})
 
@@ -246,6 +571,203 @@ def api_remove(media_type):
     return jsonify({"status": "ok"})
 
 
+@app.route("/<media_type>/api/move", methods=["POST"])
+def api_move(media_type):
+    """Move an item within its tier or to another tier.
+
+    Body: {"external_id", "tier"?, "position"?}. tier defaults to the item's
+    current tier. Without a position, a cross-tier move runs the comparison
+    flow against the destination tier only.
+    """
+    if media_type not in VALID_MEDIA_TYPES:
+        return jsonify({"error": "Invalid media type"}), 400
+
+    data = request.get_json()
+    item = models.get_item(media_type, data["external_id"])
+    if item is None:
+        return jsonify({"error": "Not ranked"}), 404
+
+    tier = data.get("tier") or item["tier"]
+    if tier not in ranking.TIER_RANGES:
+        return jsonify({"error": "Invalid tier"}), 400
+
+    position = data.get("position")
+    if position is not None:
+        try:
+            position = int(position)
+        except (TypeError, ValueError):
+            return jsonify({"error": "Position must be an integer"}), 400
+    if position is None:
+        if tier == item["tier"]:
+            return jsonify({"error": "Position required for a move within a tier"}), 400
+        comp_state = ranking.get_comparison_state(media_type, tier)
+        if comp_state is not None:
+            session["compare_state"] = {
+                "item_data": item,
+                "media_type": media_type,
+                "tier": tier,
+                "low": comp_state["low"],
+                "high": comp_state["high"],
+                "mid": None,
+                "move_id": item["external_id"],
+            }
+            return jsonify({"status": "compare", "redirect": url_for("compare_page", media_type=media_type)})
+        position = 1
+
+    ranking.move_item(media_type, item["external_id"], tier, position)
+    return jsonify({"status": "done", "redirect": url_for("index", media_type=media_type)})
+
+
+@app.route("/<media_type>/api/export")
+def api_export(media_type):
+    """Stream all rankings with scores as CSV or NDJSON."""
+    if media_type not in VALID_MEDIA_TYPES:
+        return jsonify({"error": "Invalid media type"}), 400
+
+    fmt = request.args.get("format", "csv")
+    if fmt not in exporter.FORMATS:
+        return jsonify({"error": "Invalid format"}), 400
+
+    items = ranking.iter_scored_items(media_type)
+    return Response(
+        exporter.iter_export(items, fmt),
+        mimetype=exporter.FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="geli-{media_type}.{fmt}"'},
+    )
+
+
+@app.route("/<media_type>/api/changes")
+def api_changes(media_type):
+    """Ranking changes since a sequence number, for clients keeping a copy.
+
+    Returns {"events": [...], "latest": seq, "more": bool}, or
+    {"reset": true, "items": [...], "latest": seq} when the client has no
+    copy yet (since=0) or has fallen behind the compacted log.
+    """
+    if media_type not in VALID_MEDIA_TYPES:
+        return jsonify({"error": "Invalid media type"}), 400
+
+    since = request.args.get("since", 0, type=int)
+    if since <= 0 or since < models.get_event_floor(media_type):
+        items, latest = models.get_snapshot(media_type)
+        return jsonify({"reset": True, "items": items, "latest": latest})
+
+    limit = 500
+    events = models.get_rank_events(media_type, since, limit + 1)
+    more = len(events) > limit
+    events = events[:limit]
+    latest = events[-1]["seq"] if events else since
+    return jsonify({"events": events, "latest": latest, "more": more})
+
+
+@app.cli.command("export-rankings")
+@click.argument("media_type", type=click.Choice(sorted(VALID_MEDIA_TYPES)))
+@click.option("--format", "fmt", type=click.Choice(sorted(exporter.FORMATS)), default="csv", show_default=True)
+@click.option("--output", "-o", type=click.File("w", encoding="utf-8"), default="-",
+              help="File to write to (defaults to stdout).")
+@click.option("--user", default=models.DEFAULT_USER, show_default=True, help="Whose rankings to export.")
+def export_rankings_command(media_type, fmt, output, user):
+    """Export a media type's rankings with scores."""
+    models.set_current_user(user)
+    for chunk in exporter.iter_export(ranking.iter_scored_items(media_type), fmt):
+        output.write(chunk)
+
+
+# ─── Bulk import ─────────────────────────────────────────────────────────────
+
+def _continue_import(media_type):
+    """Start the next queued import comparison and return the URL to go to."""
+    nxt = ranking.next_pending_comparison(media_type)
+    if nxt is None:
+        return url_for("index", media_type=media_type)
+    entry, low, high = nxt
+    session["compare_state"] = {
+        "item_data": entry["item_data"],
+        "media_type": media_type,
+        "tier": entry["tier"],
+        "low": low,
+        "high": high,
+        "mid": None,
+        "step": 1,
+        "pending_id": entry["id"],
+    }
+    return url_for("compare_page", media_type=media_type)
+
+
+@app.route("/<media_type>/import/continue")
+def import_continue(media_type):
+    """Resume comparisons for imported items that are still queued."""
+    if media_type not in VALID_MEDIA_TYPES:
+        return redirect(url_for("index", media_type="games"))
+    return redirect(_continue_import(media_type))
+
+
+@app.route("/<media_type>/api/import", methods=["POST"])
+def api_import(media_type):
+    """Import a CSV ratings export (uploaded as 'file' or as the raw body)."""
+    if media_type not in VALID_MEDIA_TYPES:
+        return jsonify({"error": "Invalid media type"}), 400
+
+    upload = request.files.get("file")
+    text = upload.read().decode("utf-8-sig") if upload else request.get_data(as_text=True)
+    scale = request.args.get("scale", 5, type=float)
+    if not (scale > 0 and math.isfinite(scale)):
+        return jsonify({"error": "scale must be a positive number"}), 400
+
+    rows = importer.read_ratings(text)
+    entries, unresolved = importer.resolve_titles(media_type, rows, search_provider)
+    appends, pending = ranking.plan_import(media_type, entries, scale)
+    models.import_items(media_type, appends, pending)
+
+    next_url = _continue_import(media_type)
+    status = "compare" if next_url == url_for("compare_page", media_type=media_type) else "done"
+    return jsonify({
+        "status": status,
+        "imported": sum(len(items) for items in appends.values()),
+        "queued": len(pending),
+        "unresolved": unresolved,
+        "redirect": next_url,
+    })
+
+
+@app.cli.command("import-ratings")
+@click.argument("media_type", type=click.Choice(sorted(VALID_MEDIA_TYPES)))
+@click.argument("csv_file", type=click.File("r", encoding="utf-8-sig"))
+@click.option("--scale", type=click.FloatRange(min=0, min_open=True), default=5.0, show_default=True,
+              help="Maximum rating in the export.")
+@click.option("--compare/--no-compare", default=True,
+              help="Answer queued comparisons now instead of later in the browser.")
+@click.option("--user", default=models.DEFAULT_USER, show_default=True, help="Whose rankings to import into.")
+def import_ratings_command(media_type, csv_file, scale, compare, user):
+    """Import a Letterboxd / Goodreads / Backloggd CSV export."""
+    models.set_current_user(user)
+    rows = importer.read_ratings(csv_file.read())
+    entries, unresolved = importer.resolve_titles(media_type, rows, search_provider)
+    appends, pending = ranking.plan_import(media_type, entries, scale)
+    models.import_items(media_type, appends, pending)
+
+    placed = sum(len(items) for items in appends.values())
+    click.echo(f"Imported {placed} item(s), {len(pending)} queued for comparison.")
+    for title in unresolved:
+        click.echo(f"  not found: {title}")
+    if not compare:
+        return
+
+    while (nxt := ranking.next_pending_comparison(media_type)) is not None:
+        entry, low, high = nxt
+        new_name = entry["item_data"]["name"]
+        step = 1
+        insert_pos = None
+        while insert_pos is None:
+            mid, existing = ranking.get_comparison_target(media_type, entry["tier"], low, high, step)
+            better = click.confirm(f"Is \"{new_name}\" better than \"{existing['name']}\"?")
+            answer = "better" if better else "worse"
+            low, high, insert_pos = ranking.process_comparison(answer, low, high, mid)
+            step = ranking.next_gallop_step(answer, step)
+        ranking.insert_item(entry["item_data"], media_type, entry["tier"], insert_pos)
+        models.delete_pending_import(media_type, entry["id"])
+
+
 if __name__ == "__main__":
     models.init_db()
     app.run(debug=True, port=5000)
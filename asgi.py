@@ -0,0 +1,141 @@
+"""ASGI entry point for Geli.
+
+Search requests are served on the event loop with the async provider
+clients, so a slow upstream holds a coroutine instead of a worker thread.
+Every other route goes to the Flask app running in a thread pool.
+
+    uvicorn asgi:application
+"""
+import asyncio
+import json
+import re
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+import app as geli
+import models
+import provider_backend
+from igdb_client import AsyncIGDBClient
+from openlibrary_client import AsyncOpenLibraryClient
+from tmdb_client import AsyncTMDBClient
+
+# Threads available to the Flask app — the same budget a WSGI server would have.
+WSGI_WORKERS = 10
+
+SEARCH_PATH = re.compile(r"/([^/]+)/api/search")
+
+# The whole app behind a plain thread pool, i.e. a classic WSGI deployment.
+# Kept as its own entry point so load tests can compare the two.
+wsgi_application = WSGIMiddleware(geli.app, workers=WSGI_WORKERS)
+
+# ─── Lazy-init async API clients ────────────────────────────────────────────
+_async_clients = {}
+
+
+def _live_async_client(media_type):
+    if media_type == "games":
+        return AsyncIGDBClient("creds.json")
+    if media_type == "books":
+        return AsyncOpenLibraryClient()
+    if media_type in ("movies", "tv"):
+        return AsyncTMDBClient("creds.json")
+    return None
+
+
+def get_async_client(media_type):
+    """Get or create the async API client for the media type."""
+    if media_type not in _async_clients:
+        _async_clients[media_type] = provider_backend.client_for(
+            media_type, _live_async_client, asynchronous=True
+        )
+    return _async_clients[media_type]
+
+
+async def search_provider(media_type, q):
+    """Async twin of app.search_provider."""
+    client = get_async_client(media_type)
+    if media_type == "games":
+        results = await client.search_games(q)
+    elif media_type == "books":
+        results = await client.search_books(q)
+    elif media_type == "movies":
+        results = await client.search_movies(q)
+    elif media_type == "tv":
+        results = await client.search_tv(q)
+    else:
+        results = []
+    return geli.normalize_results(media_type, results)
+
+
+def _mark_ranked(user, media_type, results):
+    with models.use_user(user):
+        return geli.mark_ranked(media_type, results)
+
+
+def _request_user(scope):
+    cookie_name = geli.app.config["SESSION_COOKIE_NAME"]
+    cookies = SimpleCookie()
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            cookies.load(value.decode("latin-1"))
+    morsel = cookies.get(cookie_name)
+    return geli.user_from_session_cookie(morsel.value if morsel else None)
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def api_search(scope, send, media_type):
+    """Search for items (same contract as the Flask route)."""
+    if media_type not in geli.VALID_MEDIA_TYPES:
+        return await _send_json(send, 400, {"error": "Invalid media type"})
+
+    q = parse_qs(scope["query_string"].decode()).get("q", [""])[0].strip()
+    if not q or len(q) < 2:
+        return await _send_json(send, 200, [])
+
+    # SQLite is blocking; keep it off the event loop
+    user = await asyncio.to_thread(_request_user, scope)
+    if user is None:
+        return await _send_json(send, 401, {"error": "Sign in at /user/ first"})
+
+    try:
+        results = await search_provider(media_type, q)
+        results = await asyncio.to_thread(_mark_ranked, user, media_type, results)
+        await _send_json(send, 200, results)
+    except Exception as e:
+        await _send_json(send, 500, {"error": str(e)})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            for client in _async_clients.values():
+                await client.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] == "http" and scope["method"] == "GET":
+        match = SEARCH_PATH.fullmatch(scope["path"])
+        if match:
+            return await api_search(scope, send, match.group(1))
+    await wsgi_application(scope, receive, send)
@@ -0,0 +1,107 @@
+"""Fingerprinted, precompressed static assets.
+
+build_assets() copies each file in ASSET_FILES to static/dist/ under a
+content-hashed name (style.<hash>.css) alongside .gz and, when the brotli
+package is installed, .br versions. A changed file gets a new URL, so
+the files can be served with an immutable, year-long Cache-Control.
+
+Builds run from `flask build-assets` (e.g. in a deploy step); the app only
+reads the manifest at startup. Each build keeps the previous build's files,
+so pages still being served by not-yet-restarted workers keep working.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always produced
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST = "manifest.json"
+
+ASSET_FILES = ("style.css", "app.js")
+
+# Served encodings, best first: (Accept-Encoding token, file suffix)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _fingerprint(name, data):
+    root, ext = os.path.splitext(name)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def _write(path, data):
+    # A private temp file per writer, so concurrent builds never share one.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _outputs(hashed):
+    """File names a build writes for one fingerprinted asset."""
+    names = [hashed, f"{hashed}.gz"]
+    if brotli is not None:
+        names.append(f"{hashed}.br")
+    return names
+
+
+def load_manifest(dist_dir=DIST_DIR):
+    """Return {name: fingerprinted name} from the last build, or {} if there isn't one."""
+    try:
+        with open(os.path.join(dist_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def build_assets(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """Fingerprint and precompress ASSET_FILES; return {name: fingerprinted name}.
+
+    Files whose fingerprint is already built are left alone, and the manifest
+    is only rewritten when it changes, so an unchanged rebuild writes nothing.
+    Safe to run from several processes at once. Outputs of the current and
+    the previous build are kept; anything older is removed.
+    """
+    os.makedirs(dist_dir, exist_ok=True)
+    previous = load_manifest(dist_dir)
+    manifest = {}
+    for name in ASSET_FILES:
+        with open(os.path.join(static_dir, name), "rb") as f:
+            data = f.read()
+        hashed = _fingerprint(name, data)
+        manifest[name] = hashed
+
+        producers = {
+            hashed: lambda: data,
+            f"{hashed}.gz": lambda: gzip.compress(data, 9, mtime=0),
+            f"{hashed}.br": lambda: brotli.compress(data, quality=11),
+        }
+        for out_name in _outputs(hashed):
+            out_path = os.path.join(dist_dir, out_name)
+            if not os.path.exists(out_path):
+                _write(out_path, producers[out_name]())
+
+    if manifest != previous:
+        _write(os.path.join(dist_dir, MANIFEST), json.dumps(manifest, indent=2).encode())
+
+    keep = {MANIFEST}
+    for hashed in (*manifest.values(), *previous.values()):
+        keep.update(_outputs(hashed))
+    for stale in set(os.listdir(dist_dir)) - keep:
+        if stale.endswith(".tmp"):
+            continue  # another build's file in progress
+        try:
+            os.remove(os.path.join(dist_dir, stale))
+        except FileNotFoundError:
+            pass
+    return manifest
@@ -0,0 +1,51 @@
+"""Streaming CSV / NDJSON export of rankings."""
+import csv
+import io
+import json
+
+EXPORT_FIELDS = (
+    "overall_rank", "tier", "rank_position", "score", "name", "external_id",
+    "release_year", "meta_line", "genres", "cover_url", "created_at",
+)
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _rows(items):
+    """Project scored items onto EXPORT_FIELDS, numbering them overall."""
+    for overall_rank, item in enumerate(items, start=1):
+        item["overall_rank"] = overall_rank
+        yield {field: item.get(field) for field in EXPORT_FIELDS}
+
+
+def iter_csv(items):
+    """Yield a CSV document one line at a time."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in _rows(items):
+        writer.writerow(row)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    # Header-only export
+    if buf.getvalue():
+        yield buf.getvalue()
+
+
+def iter_ndjson(items):
+    """Yield one JSON object per line."""
+    for row in _rows(items):
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_export(items, fmt):
+    """Dispatch to the generator for an export format ('csv' or 'ndjson')."""
+    if fmt == "csv":
+        return iter_csv(items)
+    if fmt == "ndjson":
+        return iter_ndjson(items)
+    raise ValueError(f"Unknown export format: {fmt}")
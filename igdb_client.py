@@ -4,8 +4,44 @@ import os
 import time
 import requests
 
+try:
+    import httpx
+except ImportError:  # only needed by AsyncIGDBClient
+    httpx = None
 
-class IGDBClient:
+GAME_FIELDS = (
+    "fields id, name, cover.image_id, first_release_date,"
+    " platforms.abbreviation, genres.name, summary;"
+)
+
+
+def _parse_game(g):
+    """Parse one IGDB game record into Geli's game dict."""
+    cover_id = None
+    if "cover" in g and "image_id" in g["cover"]:
+        cover_id = g["cover"]["image_id"]
+    release_year = None
+    if "first_release_date" in g:
+        release_year = time.gmtime(g["first_release_date"]).tm_year
+    platforms = []
+    if "platforms" in g:
+        platforms = [p.get("abbreviation", "?") for p in g["platforms"]]
+    genres = []
+    if "genres" in g:
+        genres = [ge["name"] for ge in g["genres"]]
+    return {
+        "igdb_id": g["id"],
+        "name": g["name"],
+        "cover_url": f"https://images.igdb.com/igdb/image/upload/t_cover_big/{cover_id}.jpg" if cover_id else None,
+        "release_year": release_year,
+        "platforms": ", ".join(platforms),
+        "genres": ", ".join(genres),
+        "summary": g.get("summary", ""),
+    }
+
+
+class _IGDBBase:
+    """Credentials and token state shared by the sync and async clients."""
     TOKEN_URL = "https://id.twitch.tv/oauth2/token"
     API_BASE = "https://api.igdb.com/v4"
 
@@ -30,27 +66,49 @@ class IGDBClient:
         self.access_token = None
         self.token_expires_at = 0
 
-    def _get_token(self):
-        """Fetch a new access token from Twitch."""
-        resp = requests.post(self.TOKEN_URL, data={
+    def _token_request(self):
+        return {
             "client_id": self.client_id,
             "client_secret": self.client_secret,
             "grant_type": "client_credentials",
-        })
-        data = resp.json()
+        }
+
+    def _store_token(self, data):
         if "access_token" not in data:
             raise RuntimeError(f"Failed to get IGDB token: {data}")
         self.access_token = data["access_token"]
         self.token_expires_at = time.time() + data["expires_in"] - 60
 
-    def _headers(self):
-        if not self.access_token or time.time() >= self.token_expires_at:
-            self._get_token()
+    def _token_valid(self):
+        return self.access_token and time.time() < self.token_expires_at
+
+    def _auth_headers(self):
         return {
             "Client-ID": self.client_id,
             "Authorization": f"Bearer {self.access_token}",
         }
 
+    @staticmethod
+    def _search_body(query, limit):
+        return f'{GAME_FIELDS} search "{query}"; limit {limit};'
+
+    @staticmethod
+    def _by_id_body(igdb_id):
+        return f"{GAME_FIELDS} where id = {igdb_id};"
+
+
+class IGDBClient(_IGDBBase):
+
+    def _get_token(self):
+        """Fetch a new access token from Twitch."""
+        resp = requests.post(self.TOKEN_URL, data=self._token_request())
+        self._store_token(resp.json())
+
+    def _headers(self):
+        if not self._token_valid():
+            self._get_token()
+        return self._auth_headers()
+
     def _request(self, endpoint, query):
         """Make an IGDB API request with automatic token refresh on 401."""
         url = f"{self.API_BASE}/{endpoint}"
@@ -63,68 +121,57 @@ class IGDBClient:
 
     def search_games(self, query, limit=20):
         """Search for games by name. Returns list of game dicts."""
-        body = (
-            f"fields id, name, cover.image_id, first_release_date,"
-            f" platforms.abbreviation, genres.name, summary;"
-            f' search "{query}";'
-            f" limit {limit};"
-        )
-        results = self._request("games", body)
-        games = []
-        for g in results:
-            cover_id = None
-            if "cover" in g and "image_id" in g["cover"]:
-                cover_id = g["cover"]["image_id"]
-            release_year = None
-            if "first_release_date" in g:
-                release_year = time.gmtime(g["first_release_date"]).tm_year
-            platforms = []
-            if "platforms" in g:
-                platforms = [p.get("abbreviation", "?") for p in g["platforms"]]
-            genres = []
-            if "genres" in g:
-                genres = [ge["name"] for ge in g["genres"]]
-            games.append({
-                "igdb_id": g["id"],
-                "name": g["name"],
-                "cover_url": f"https://images.igdb.com/igdb/image/upload/t_cover_big/{cover_id}.jpg" if cover_id else None,
-                "release_year": release_year,
-                "platforms": ", ".join(platforms),
-                "genres": ", ".join(genres),
-                "summary": g.get("summary", ""),
-            })
-        return games
-
+        results = self._request("games", self._search_body(query, limit))
+        return [_parse_game(g) for g in results]
 
     def get_game_by_id(self, igdb_id):
         """Fetch a single game by IGDB ID, parsed."""
-        body = (
-            f"fields id, name, cover.image_id, first_release_date,"
-            f" platforms.abbreviation, genres.name, summary;"
-            f" where id = {igdb_id};"
-        )
-        results = self._request("games", body)
+        results = self._request("games", self._by_id_body(igdb_id))
         if not results:
             return None
-        g = results[0]
-        cover_id = None
-        if "cover" in g and "image_id" in g["cover"]:
-            cover_id = g["cover"]["image_id"]
-        release_year = None
-        if "first_release_date" in g:
-            release_year = time.gmtime(g["first_release_date"]).tm_year
-        platforms = []
-        if "platforms" in g:
-            platforms = [p.get("abbreviation", "?") for p in g["platforms"]]
-        genres = []
-        if "genres" in g:
-            genres = [ge["name"] for ge in g["genres"]]
-        return {
-            "igdb_id": g["id"],
-            "name": g["name"],
-            "cover_url": f"https://images.igdb.com/igdb/image/upload/t_cover_big/{cover_id}.jpg" if cover_id else None,
-            "release_year": release_year,
-            "platforms": ", ".join(platforms),
-            "genres": ", ".join(genres),
-            "summary": g.get("summary", ""),
-        }
+        return _parse_game(results[0])
+
+
+class AsyncIGDBClient(_IGDBBase):
+    """Non-blocking IGDB client (requires httpx); same results as IGDBClient."""
+
+    def __init__(self, creds_path="creds.json"):
+        if httpx is None:
+            raise RuntimeError("AsyncIGDBClient requires httpx (pip install httpx).")
+        super().__init__(creds_path)
+        self._http = httpx.AsyncClient(timeout=10)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _get_token(self):
+        """Fetch a new access token from Twitch."""
+        resp = await self._http.post(self.TOKEN_URL, data=self._token_request())
+        self._store_token(resp.json())
+
+    async def _headers(self):
+        if not self._token_valid():
+            await self._get_token()
+        return self._auth_headers()
+
+    async def _request(self, endpoint, query):
+        """Make an IGDB API request with automatic token refresh on 401."""
+        url = f"{self.API_BASE}/{endpoint}"
+        resp = await self._http.post(url, headers=await self._headers(), content=query)
+        if resp.status_code == 401:
+            await self._get_token()
+            resp = await self._http.post(url, headers=await self._headers(), content=query)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def search_games(self, query, limit=20):
+        """Search for games by name. Returns list of game dicts."""
+        results = await self._request("games", self._search_body(query, limit))
+        return [_parse_game(g) for g in results]
+
+    async def get_game_by_id(self, igdb_id):
+        """Fetch a single game by IGDB ID, parsed."""
+        results = await self._request("games", self._by_id_body(igdb_id))
+        if not results:
+            return None
+        return _parse_game(results[0])
@@ -0,0 +1,83 @@
+"""Bulk import of external rating exports (Letterboxd, Goodreads, Backloggd CSVs)."""
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import models
+
+# Column names used by the exports we know about, in order of preference.
+TITLE_COLUMNS = ("Name", "Title", "name", "title")
+RATING_COLUMNS = ("Rating", "My Rating", "rating", "my_rating")
+YEAR_COLUMNS = ("Year", "Original Publication Year", "Year Published", "year")
+
+
+def _first(row, columns):
+    for col in columns:
+        value = (row.get(col) or "").strip()
+        if value:
+            return value
+    return None
+
+
+def read_ratings(text):
+    """Parse a CSV export into [{"title", "year", "rating"}], skipping unrated rows."""
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        title = _first(row, TITLE_COLUMNS)
+        rating = _first(row, RATING_COLUMNS)
+        if not title or not rating:
+            continue
+        try:
+            rating = float(rating)
+        except ValueError:
+            continue
+        if rating <= 0:
+            # Goodreads writes 0 for "shelved but not rated"
+            continue
+        year = _first(row, YEAR_COLUMNS)
+        rows.append({
+            "title": title,
+            "year": int(year[:4]) if year and year[:4].isdigit() else None,
+            "rating": rating,
+        })
+    return rows
+
+
+def _best_match(results, year):
+    """Pick the search result matching the export's year, else the top hit."""
+    if not results:
+        return None
+    if year:
+        for r in results:
+            if r.get("release_year") == year:
+                return r
+    return results[0]
+
+
+def resolve_titles(media_type, rows, search_fn, batch_size=8):
+    """Look each row up through search_fn(media_type, query) in concurrent batches.
+
+    Returns (entries, unresolved): entries are {"item_data", "rating"} for
+    titles that matched and aren't ranked yet, unresolved the titles that
+    found nothing or whose lookup failed.
+    """
+    def lookup(row):
+        try:
+            return _best_match(search_fn(media_type, row["title"]), row["year"])
+        except Exception:
+            return None
+
+    entries, unresolved, seen = [], [], set()
+    with ThreadPoolExecutor(max_workers=batch_size) as pool:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            for row, match in zip(batch, pool.map(lookup, batch)):
+                if match is None:
+                    unresolved.append(row["title"])
+                    continue
+                external_id = str(match["external_id"])
+                if external_id in seen or models.item_exists(media_type, external_id):
+                    continue
+                seen.add(external_id)
+                entries.append({"item_data": match, "rating": row["rating"]})
+    return entries, unresolved
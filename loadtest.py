@@ -0,0 +1,167 @@
+"""Load test: do slow upstream searches starve the rankings pages?
+
+Starts a local Open Library stub that answers every search after --delay
+seconds, runs Geli under uvicorn against it, then fires a burst of book
+searches and, while they are in flight, requests the rankings page.
+
+    python loadtest.py --mode wsgi   # whole app on a WSGI thread pool
+    python loadtest.py --mode asgi   # async search path (asgi:application)
+
+With --replay STORE the stub is skipped and searches are answered by the
+replay provider backend instead (see provider_backend.py), with --delay as
+the injected latency and --error-rate as the injected failure rate. The
+searches are the ones recorded in STORE, replayed strictly, so a search
+that isn't in the store fails instead of returning a fast empty result.
+
+Requires uvicorn, a2wsgi and httpx.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import provider_backend
+
+ENTRY_POINTS = {
+    "wsgi": "asgi:wsgi_application",
+    "asgi": "asgi:application",
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(delay):
+    """Serve a fake /search.json that sleeps `delay` seconds per request."""
+    body = json.dumps({"docs": [
+        {"key": f"/works/OL{i}W", "title": f"Stub Book {i}", "author_name": ["Stub Author"]}
+        for i in range(10)
+    ]}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", _free_port()), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_app(mode, env_overrides):
+    port = _free_port()
+    env = dict(os.environ, **env_overrides)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", ENTRY_POINTS[mode], "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{base}/books/", timeout=1)
+            return proc, base
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("app did not start")
+
+
+def recorded_searches(store_path):
+    """(media_type, query) for every search recorded in a response store."""
+    if not os.path.exists(store_path):
+        raise SystemExit(f"No response store at {store_path}")
+    store = provider_backend.ResponseStore(store_path)
+    searches = [
+        (media_type, args[0])
+        for media_type, method, args, kwargs in store.recorded_calls()
+        if method.startswith("search_") and len(args) == 1 and not kwargs
+    ]
+    if not searches:
+        raise SystemExit(f"No recorded searches in {store_path}; record some with GELI_PROVIDER_BACKEND=record")
+    return searches
+
+
+def _timed_get(url, params=None):
+    start = time.perf_counter()
+    resp = requests.get(url, params=params, timeout=60)
+    return time.perf_counter() - start, resp.ok
+
+
+def _summary(label, results):
+    samples = sorted(elapsed for elapsed, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{label:<8} n={len(samples):<4} p50={statistics.median(samples):.3f}s "
+          f"p95={p95:.3f}s max={samples[-1]:.3f}s errors={errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=sorted(ENTRY_POINTS), default="asgi")
+    parser.add_argument("--delay", type=float, default=2.0, help="Stub upstream latency in seconds.")
+    parser.add_argument("--searches", type=int, default=40, help="Concurrent searches to fire.")
+    parser.add_argument("--pages", type=int, default=20, help="Rankings page loads during the burst.")
+    parser.add_argument("--replay", metavar="STORE", help="Replay recorded responses from STORE instead of the stub.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected failure rate (with --replay).")
+    args = parser.parse_args()
+
+    if args.replay:
+        stub = None
+        store_path = os.path.abspath(args.replay)
+        queries = recorded_searches(store_path)
+        env = {
+            "GELI_PROVIDER_BACKEND": "replay",
+            "GELI_PROVIDER_STORE": store_path,
+            "GELI_REPLAY_LATENCY_MS": str(args.delay * 1000),
+            "GELI_REPLAY_ERROR_RATE": str(args.error_rate),
+            "GELI_REPLAY_STRICT": "1",
+        }
+    else:
+        stub = start_stub(args.delay)
+        queries = [("books", f"load{i}") for i in range(args.searches)]
+        env = {"OPENLIBRARY_BASE_URL": f"http://127.0.0.1:{stub.server_port}"}
+    proc, base = start_app(args.mode, env)
+    try:
+        with ThreadPoolExecutor(max_workers=args.searches + args.pages) as pool:
+            searches = []
+            for i in range(args.searches):
+                media_type, q = queries[i % len(queries)]
+                searches.append(pool.submit(_timed_get, f"{base}/{media_type}/api/search", {"q": q}))
+            time.sleep(min(0.5, args.delay / 2))  # let the searches occupy the server
+            pages = [pool.submit(_timed_get, f"{base}/books/") for _ in range(args.pages)]
+            page_times = [f.result() for f in pages]
+            search_times = [f.result() for f in searches]
+    finally:
+        proc.terminate()
+        proc.wait()
+        if stub:
+            stub.shutdown()
+
+    print(f"mode={args.mode} upstream delay={args.delay}s")
+    _summary("pages", page_times)
+    _summary("search", search_times)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,220 @@
-"""SQLite database models for Geli — multi-media rankings storage."""
+"""SQLite database models for Geli — multi-media rankings storage.
+
+Each user's rankings live in their own SQLite shard so users never share a
+write lock. The shard is picked from the current user (see use_user /
+set_current_user); the default user keeps the original geli.db.
+"""
+import contextlib
+import contextvars
+import json
+import re
 import sqlite3
 import os
+import secrets
+import threading
+from collections import OrderedDict
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "geli.db")
+SHARD_DIR = os.path.join(os.path.dirname(__file__), "shards")
 
 VALID_MEDIA_TYPES = {"games", "books", "movies", "tv"}
 
+# Tiers from best to worst.
+TIER_ORDER = ("like", "neutral", "dislike")
 
-def get_db():
-    """Get a database connection with row factory."""
-    conn = sqlite3.connect(DB_PATH)
+DEFAULT_USER = "default"
+USERNAME_RE = re.compile(r"[A-Za-z0-9_-]{1,32}")
+
+# Open shard connections kept per thread before the least recently used is closed.
+MAX_CACHED_SHARDS = 16
+
+_current_user = contextvars.ContextVar("geli_user", default=DEFAULT_USER)
+
+
+def valid_username(user):
+    return bool(USERNAME_RE.fullmatch(user or ""))
+
+
+def set_current_user(user):
+    """Route this thread / task's database calls to a user's shard."""
+    if not valid_username(user):
+        raise ValueError(f"Invalid username: {user!r}")
+    _current_user.set(user)
+
+
+def get_current_user():
+    return _current_user.get()
+
+
+@contextlib.contextmanager
+def use_user(user):
+    """Temporarily route database calls to a user's shard."""
+    if not valid_username(user):
+        raise ValueError(f"Invalid username: {user!r}")
+    token = _current_user.set(user)
+    try:
+        yield
+    finally:
+        _current_user.reset(token)
+
+
+def db_path_for(user):
+    """Path of a user's shard."""
+    if user == DEFAULT_USER:
+        return DB_PATH
+    return os.path.join(SHARD_DIR, f"{user}.db")
+
+
+# ─── Data versions ──────────────────────────────────────────────────────────
+# Every write bumps a per-media-type counter in the shard's data_versions
+# table, inside the write's own transaction, so writers in other processes
+# (the CLI, other server workers) are seen too. Each thread caches the
+# counters it last read per shard and only re-reads them when SQLite's
+# PRAGMA data_version says another connection has committed since, so an
+# unchanged shard costs no table read. The shard's random epoch keeps a
+# recreated database from reusing old versions.
+
+
+def _bump_version(conn, media_type):
+    """Bump a media type's version on conn; the caller owns the transaction."""
+    conn.execute(
+        "UPDATE data_versions SET version = version + 1 WHERE name = ?", (media_type,)
+    )
+    # data_version only reports other connections' commits, so forget what
+    # this thread cached rather than trust it after our own write.
+    _thread_cache("versions").pop(db_path_for(get_current_user()), None)
+
+
+def _read_versions(conn, path):
+    versions = _thread_cache("versions")
+    changes = conn.execute("PRAGMA data_version").fetchone()[0]
+    cached = versions.get(path)
+    if cached and cached[0] == changes:
+        return cached[1]
+    rows = conn.execute("SELECT name, version FROM data_versions").fetchall()
+    versions[path] = (changes, {r["name"]: r["version"] for r in rows})
+    return versions[path][1]
+
+
+def get_data_version(media_type):
+    """Return an opaque token that changes whenever the current user's
+    rankings for a media type change, in this process or any other."""
+    user = get_current_user()
+    conn = get_db()
+    versions = _read_versions(conn, db_path_for(user))
+    conn.close()
+    return f"{versions['epoch']:x}-{user}-{versions.get(media_type, 0)}"
+
+
+# ─── Credentials ─────────────────────────────────────────────────────────────
+
+# Claims are never undone, so once a user is seen claimed it stays cached.
+_claimed_users = set()
+
+
+def get_passphrase_hash():
+    """Return the current user's passphrase hash, or None if the shard is unclaimed.
+    Never creates the shard; only claim_user does that."""
+    if not os.path.exists(db_path_for(get_current_user())):
+        return None
+    conn = get_db()
+    row = conn.execute("SELECT passphrase_hash FROM credentials WHERE id = 1").fetchone()
+    conn.close()
+    return row["passphrase_hash"] if row else None
+
+
+def claim_user(passphrase_hash):
+    """Set the current user's passphrase hash unless someone already has.
+    Returns the hash now stored, which is the caller's only if they won."""
+    conn = get_db()
+    conn.execute(
+        "INSERT OR IGNORE INTO credentials (id, passphrase_hash) VALUES (1, ?)",
+        (passphrase_hash,),
+    )
+    conn.commit()
+    conn.close()
+    return get_passphrase_hash()
+
+
+def is_claimed(user):
+    """Whether someone has set a passphrase for user."""
+    if user in _claimed_users:
+        return True
+    with use_user(user):
+        claimed = get_passphrase_hash() is not None
+    if claimed:
+        _claimed_users.add(user)
+    return claimed
+
+
+# ─── Connections ─────────────────────────────────────────────────────────────
+# sqlite3 connections can't cross threads, so each thread keeps its own
+# LRU of shard connections. Schemas are initialized once per shard per process.
+_local = threading.local()
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+
+def _thread_cache(name):
+    """This thread's OrderedDict named `name` (shard connections, data versions)."""
+    cache = getattr(_local, name, None)
+    if cache is None:
+        cache = OrderedDict()
+        setattr(_local, name, cache)
+    return cache
+
+
+class _CachedConnection:
+    """A shard connection from the cache. close() hands it back rather than
+    closing it, rolling back anything the caller left uncommitted."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn.in_transaction:
+            self._conn.rollback()
+
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    with _init_lock:
+        if path not in _initialized_paths:
+            _init_schema(conn)
+            _initialized_paths.add(path)
     return conn
 
 
+def get_db():
+    """Get the current user's shard connection (cached per thread)."""
+    cache = _thread_cache("connections")
+    path = db_path_for(get_current_user())
+    conn = cache.get(path)
+    if conn is None:
+        conn = cache[path] = _connect(path)
+        if len(cache) > MAX_CACHED_SHARDS:
+            evicted_path, evicted = cache.popitem(last=False)
+            evicted.close()
+            _thread_cache("versions").pop(evicted_path, None)
+    else:
+        cache.move_to_end(path)
+    return _CachedConnection(conn)
+
+
 def init_db():
-    """Create tables if they don't exist and migrate if needed."""
+    """Create the current user's tables if they don't exist and migrate if needed."""
     conn = get_db()
+    _init_schema(conn)
+    conn.close()
+
 
+def _init_schema(conn):
     # Check if we need to migrate from the old schema
     cursor = conn.execute("PRAGMA table_info(games)")
     columns = {row["name"] for row in cursor.fetchall()}
@@ -71,35 +267,155 @@ def init_db():
         """)
     # If 'items' table already exists with media_type, nothing to do
 
-    conn.commit()
-    conn.close()
+    # Serves every tier-ordered read (a tier in rank order, per-tier counts).
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_items_media_tier_rank ON items (media_type, tier, rank_position)"
+    )
 
+    # Imported titles whose position still needs a pairwise comparison.
+    # after/before hold external_ids bounding where the item may land.
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS pending_imports (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            media_type  TEXT NOT NULL,
+            tier        TEXT NOT NULL,
+            item_json   TEXT NOT NULL,
+            after_ids   TEXT NOT NULL DEFAULT '[]',
+            before_ids  TEXT NOT NULL DEFAULT '[]'
+        );
 
-def add_item(item_data, media_type, tier, rank_position):
-    """Insert a new item into the database."""
-    conn = get_db()
+        -- Append-only log of ranking changes for delta sync. Clients replay
+        -- events in seq order: 'insert' places an item at (tier, rank_position)
+        -- pushing the rest of the tier down, 'remove' closes the gap it leaves,
+        -- 'move' is a remove followed by an insert at the new spot.
+        CREATE TABLE IF NOT EXISTS rank_events (
+            seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+            media_type    TEXT NOT NULL,
+            event         TEXT NOT NULL CHECK(event IN ('insert','remove','move')),
+            external_id   TEXT NOT NULL,
+            tier          TEXT,
+            rank_position INTEGER,
+            item_json     TEXT,
+            created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_rank_events_media_seq ON rank_events (media_type, seq);
+
+        -- Highest seq dropped by compaction; clients behind it must resync.
+        CREATE TABLE IF NOT EXISTS rank_event_floors (
+            media_type TEXT PRIMARY KEY,
+            floor_seq  INTEGER NOT NULL
+        );
+
+        -- The shard owner's passphrase hash (see claim_user); at most one row.
+        CREATE TABLE IF NOT EXISTS credentials (
+            id              INTEGER PRIMARY KEY CHECK(id = 1),
+            passphrase_hash TEXT NOT NULL
+        );
+
+        -- Per-media-type write counters plus the shard's epoch (see get_data_version).
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name    TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+    """)
     conn.execute(
-        """INSERT OR REPLACE INTO items
+        "INSERT OR IGNORE INTO data_versions (name, version) VALUES ('epoch', ?)",
+        (secrets.randbits(32),),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)",
+        [(mt,) for mt in sorted(VALID_MEDIA_TYPES)],
+    )
+
+    conn.commit()
+
+
+_INSERT_ITEM_SQL = """INSERT OR REPLACE INTO items
            (external_id, media_type, name, cover_url, meta_line, genres,
             release_year, summary, tier, rank_position)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            str(item_data["external_id"]),
-            media_type,
-            item_data["name"],
-            item_data.get("cover_url"),
-            item_data.get("meta_line", ""),
-            item_data.get("genres", ""),
-            item_data.get("release_year"),
-            item_data.get("summary", ""),
-            tier,
-            rank_position,
-        ),
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def _item_row(item_data, media_type, tier, rank_position):
+    """Build the parameter tuple for _INSERT_ITEM_SQL."""
+    return (
+        str(item_data["external_id"]),
+        media_type,
+        item_data["name"],
+        item_data.get("cover_url"),
+        item_data.get("meta_line", ""),
+        item_data.get("genres", ""),
+        item_data.get("release_year"),
+        item_data.get("summary", ""),
+        tier,
+        rank_position,
+    )
+
+
+# Keep this many events per media type when compacting the log, and compact
+# every COMPACT_INTERVAL events.
+RANK_EVENTS_KEEP = 1000
+COMPACT_INTERVAL = 100
+
+
+def _log_event(conn, media_type, event, external_id, tier=None, rank_position=None, item_data=None):
+    """Append a rank event on conn; the caller owns the transaction."""
+    cursor = conn.execute(
+        """INSERT INTO rank_events (media_type, event, external_id, tier, rank_position, item_json)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        (media_type, event, str(external_id), tier, rank_position,
+         json.dumps(item_data) if item_data is not None else None),
+    )
+    if cursor.lastrowid % COMPACT_INTERVAL == 0:
+        _compact_rank_events(conn, media_type, RANK_EVENTS_KEEP)
+
+
+def _compact_rank_events(conn, media_type, keep):
+    row = conn.execute(
+        "SELECT seq FROM rank_events WHERE media_type = ? ORDER BY seq DESC LIMIT 1 OFFSET ?",
+        (media_type, keep),
+    ).fetchone()
+    if row is None:
+        return
+    conn.execute(
+        "DELETE FROM rank_events WHERE media_type = ? AND seq <= ?",
+        (media_type, row["seq"]),
     )
+    conn.execute(
+        "INSERT OR REPLACE INTO rank_event_floors (media_type, floor_seq) VALUES (?, ?)",
+        (media_type, row["seq"]),
+    )
+
+
+def compact_rank_events(media_type, keep=RANK_EVENTS_KEEP):
+    """Drop all but the newest `keep` events for a media type."""
+    conn = get_db()
+    _compact_rank_events(conn, media_type, keep)
     conn.commit()
     conn.close()
 
 
+def insert_item(item_data, media_type, tier, rank_position):
+    """Insert an item at rank_position, shifting the rest of the tier down,
+    and log it — all in one transaction."""
+    conn = get_db()
+    try:
+        conn.execute(
+            """UPDATE items SET rank_position = rank_position + 1
+               WHERE media_type = ? AND tier = ? AND rank_position >= ?""",
+            (media_type, tier, rank_position),
+        )
+        conn.execute(_INSERT_ITEM_SQL, _item_row(item_data, media_type, tier, rank_position))
+        _log_event(conn, media_type, "insert", item_data["external_id"], tier, rank_position, item_data)
+        _bump_version(conn, media_type)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
 def get_items_by_tier(media_type, tier):
     """Get all items in a tier for a media type, ordered by rank_position."""
     conn = get_db()
@@ -129,6 +445,50 @@ def get_all_ranked_items(media_type):
     return [dict(r) for r in rows]
 
 
+def iter_ranked_items(media_type, limit=None):
+    """Yield items for a media type in tier then rank order, one row at a time.
+
+    Each tier is its own query walking idx_items_media_tier_rank, so the
+    first row comes straight off the index with no sort, and with a limit
+    at most `limit` rows are read in total. Rows are pulled from the cursor
+    as the caller consumes them, so large lists never have to fit in memory.
+    Tiers are read one after another rather than in one snapshot. The
+    connection is released when the generator is exhausted or closed.
+    """
+    conn = get_db()
+    remaining = -1 if limit is None else limit
+    cursor = None
+    try:
+        for tier in TIER_ORDER:
+            if remaining == 0:
+                break
+            cursor = conn.execute(
+                """SELECT * FROM items WHERE media_type = ? AND tier = ?
+                   ORDER BY rank_position ASC LIMIT ?""",
+                (media_type, tier, remaining),
+            )
+            for row in cursor:
+                if remaining > 0:
+                    remaining -= 1
+                yield dict(row)
+            cursor.close()
+    finally:
+        if cursor is not None:
+            cursor.close()
+        conn.close()
+
+
+def count_items_by_tier(media_type):
+    """Return {tier: count} for a media type (tiers with no items are omitted)."""
+    conn = get_db()
+    rows = conn.execute(
+        "SELECT tier, COUNT(*) AS n FROM items WHERE media_type = ? GROUP BY tier",
+        (media_type,),
+    ).fetchall()
+    conn.close()
+    return {r["tier"]: r["n"] for r in rows}
+
+
 def count_items(media_type):
     """Return total number of ranked items for a media type."""
     conn = get_db()
@@ -161,18 +521,6 @@ def get_item_at_rank(media_type, tier, rank_position):
     return dict(row) if row else None
 
 
-def shift_ranks_down(media_type, tier, from_position):
-    """Shift all items at or after from_position down by 1."""
-    conn = get_db()
-    conn.execute(
-        """UPDATE items SET rank_position = rank_position + 1
-           WHERE media_type = ? AND tier = ? AND rank_position >= ?""",
-        (media_type, tier, from_position),
-    )
-    conn.commit()
-    conn.close()
-
-
 def item_exists(media_type, external_id):
     """Check if an item is already ranked."""
     conn = get_db()
@@ -184,6 +532,20 @@ def item_exists(media_type, external_id):
     return row is not None
 
 
+def get_ranked_ids(media_type, external_ids):
+    """Return the subset of external_ids (as strings) that are already ranked."""
+    if not external_ids:
+        return set()
+    conn = get_db()
+    placeholders = ", ".join("?" for _ in external_ids)
+    rows = conn.execute(
+        f"SELECT external_id FROM items WHERE media_type = ? AND external_id IN ({placeholders})",
+        (media_type, *[str(e) for e in external_ids]),
+    ).fetchall()
+    conn.close()
+    return {r["external_id"] for r in rows}
+
+
 def remove_item(media_type, external_id):
     """Remove an item from rankings."""
     conn = get_db()
@@ -201,5 +563,230 @@ def remove_item(media_type, external_id):
                WHERE media_type = ? AND tier = ? AND rank_position > ?""",
             (media_type, item["tier"], item["rank_position"]),
         )
+        _log_event(conn, media_type, "remove", external_id, item["tier"], item["rank_position"])
+        _bump_version(conn, media_type)
         conn.commit()
     conn.close()
+
+
+def get_item(media_type, external_id):
+    """Get a single ranked item by external id."""
+    conn = get_db()
+    row = conn.execute(
+        "SELECT * FROM items WHERE media_type = ? AND external_id = ?",
+        (media_type, str(external_id)),
+    ).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def move_item(media_type, external_id, tier, rank_position):
+    """Move a ranked item to rank_position in tier (possibly its current tier).
+
+    A same-tier move is one UPDATE over the rows between the old and new
+    positions; a cross-tier move closes the gap in the old tier and opens one
+    in the new tier. Either way the change and its log entry commit together.
+    Positions are clamped to the tier. Returns False if the item isn't ranked.
+    """
+    external_id = str(external_id)
+    conn = get_db()
+    try:
+        item = conn.execute(
+            "SELECT tier, rank_position FROM items WHERE media_type = ? AND external_id = ?",
+            (media_type, external_id),
+        ).fetchone()
+        if not item:
+            return False
+        old_tier, old_pos = item["tier"], item["rank_position"]
+
+        if tier == old_tier:
+            tier_count = conn.execute(
+                "SELECT COUNT(*) FROM items WHERE media_type = ? AND tier = ?",
+                (media_type, tier),
+            ).fetchone()[0]
+            new_pos = max(1, min(rank_position, tier_count))
+            if new_pos == old_pos:
+                return True
+            if new_pos < old_pos:
+                low, high, delta = new_pos, old_pos, 1
+            else:
+                low, high, delta = old_pos, new_pos, -1
+            conn.execute(
+                """UPDATE items SET rank_position = CASE
+                       WHEN external_id = ? THEN ? ELSE rank_position + ? END
+                   WHERE media_type = ? AND tier = ? AND rank_position BETWEEN ? AND ?""",
+                (external_id, new_pos, delta, media_type, tier, low, high),
+            )
+        else:
+            tier_count = conn.execute(
+                "SELECT COUNT(*) FROM items WHERE media_type = ? AND tier = ?",
+                (media_type, tier),
+            ).fetchone()[0]
+            new_pos = max(1, min(rank_position, tier_count + 1))
+            conn.execute(
+                """UPDATE items SET rank_position = rank_position - 1
+                   WHERE media_type = ? AND tier = ? AND rank_position > ?""",
+                (media_type, old_tier, old_pos),
+            )
+            conn.execute(
+                """UPDATE items SET rank_position = rank_position + 1
+                   WHERE media_type = ? AND tier = ? AND rank_position >= ?""",
+                (media_type, tier, new_pos),
+            )
+            conn.execute(
+                "UPDATE items SET tier = ?, rank_position = ? WHERE media_type = ? AND external_id = ?",
+                (tier, new_pos, media_type, external_id),
+            )
+        _log_event(conn, media_type, "move", external_id, tier, new_pos)
+        _bump_version(conn, media_type)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return True
+
+
+def get_rank_positions(media_type, tier, external_ids):
+    """Map each of external_ids that is ranked in the tier to its rank_position."""
+    if not external_ids:
+        return {}
+    conn = get_db()
+    placeholders = ", ".join("?" for _ in external_ids)
+    rows = conn.execute(
+        f"""SELECT external_id, rank_position FROM items
+            WHERE media_type = ? AND tier = ? AND external_id IN ({placeholders})""",
+        (media_type, tier, *[str(e) for e in external_ids]),
+    ).fetchall()
+    conn.close()
+    return {r["external_id"]: r["rank_position"] for r in rows}
+
+
+# ─── Bulk import ─────────────────────────────────────────────────────────────
+
+def import_items(media_type, appends, pending):
+    """Apply an import plan in a single transaction.
+
+    appends maps tier → item dicts to place at the end of that tier, in order.
+    pending is a list of {"item_data", "tier", "after", "before"} entries to
+    queue for pairwise comparison.
+    """
+    conn = get_db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for tier, items in appends.items():
+            tail = conn.execute(
+                "SELECT COALESCE(MAX(rank_position), 0) FROM items WHERE media_type = ? AND tier = ?",
+                (media_type, tier),
+            ).fetchone()[0]
+            for i, item in enumerate(items, start=1):
+                conn.execute(_INSERT_ITEM_SQL, _item_row(item, media_type, tier, tail + i))
+                _log_event(conn, media_type, "insert", item["external_id"], tier, tail + i, item)
+        conn.executemany(
+            """INSERT INTO pending_imports (media_type, tier, item_json, after_ids, before_ids)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (media_type, e["tier"], json.dumps(e["item_data"]),
+                 json.dumps(e["after"]), json.dumps(e["before"]))
+                for e in pending
+            ],
+        )
+        _bump_version(conn, media_type)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_next_pending_import(media_type):
+    """Return the oldest queued import entry for a media type, or None."""
+    conn = get_db()
+    row = conn.execute(
+        "SELECT * FROM pending_imports WHERE media_type = ? ORDER BY id ASC LIMIT 1",
+        (media_type,),
+    ).fetchone()
+    conn.close()
+    if not row:
+        return None
+    return {
+        "id": row["id"],
+        "tier": row["tier"],
+        "item_data": json.loads(row["item_json"]),
+        "after": json.loads(row["after_ids"]),
+        "before": json.loads(row["before_ids"]),
+    }
+
+
+def count_pending_imports(media_type):
+    """Return the number of imported items still waiting for a comparison."""
+    conn = get_db()
+    count = conn.execute(
+        "SELECT COUNT(*) FROM pending_imports WHERE media_type = ?", (media_type,)
+    ).fetchone()[0]
+    conn.close()
+    return count
+
+
+def delete_pending_import(media_type, pending_id):
+    """Drop a queued import entry once it has been placed (or skipped)."""
+    conn = get_db()
+    conn.execute(
+        "DELETE FROM pending_imports WHERE media_type = ? AND id = ?",
+        (media_type, pending_id),
+    )
+    _bump_version(conn, media_type)
+    conn.commit()
+    conn.close()
+
+
+# ─── Change log ──────────────────────────────────────────────────────────────
+
+def get_event_floor(media_type):
+    """Return the highest seq removed by compaction for a media type (0 if none)."""
+    conn = get_db()
+    row = conn.execute(
+        "SELECT floor_seq FROM rank_event_floors WHERE media_type = ?", (media_type,)
+    ).fetchone()
+    conn.close()
+    return row["floor_seq"] if row else 0
+
+
+def get_rank_events(media_type, since, limit=500):
+    """Return up to `limit` events for a media type with seq > since, oldest first."""
+    conn = get_db()
+    rows = conn.execute(
+        """SELECT seq, event, external_id, tier, rank_position, item_json, created_at
+           FROM rank_events WHERE media_type = ? AND seq > ?
+           ORDER BY seq ASC LIMIT ?""",
+        (media_type, since, limit),
+    ).fetchall()
+    conn.close()
+    events = []
+    for r in rows:
+        event = dict(r)
+        item_json = event.pop("item_json")
+        event["item"] = json.loads(item_json) if item_json else None
+        events.append(event)
+    return events
+
+
+def get_snapshot(media_type):
+    """Return (items, latest_seq): every ranked item plus the seq it reflects,
+    read in one transaction so the two agree."""
+    conn = get_db()
+    conn.execute("BEGIN")
+    try:
+        # Any seq at or past this media type's last event is a valid cursor,
+        # so use the global one.
+        latest = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM rank_events").fetchone()[0]
+        rows = conn.execute(
+            "SELECT * FROM items WHERE media_type = ? ORDER BY tier, rank_position",
+            (media_type,),
+        ).fetchall()
+    finally:
+        conn.rollback()
+        conn.close()
+    return [dict(r) for r in rows], latest
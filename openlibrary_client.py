@@ -1,21 +1,43 @@
 """Open Library API client — no authentication required."""
+import asyncio
+import os
 import requests
 
+try:
+    import httpx
+except ImportError:  # only needed by AsyncOpenLibraryClient
+    httpx = None
 
-class OpenLibraryClient:
-    SEARCH_URL = "https://openlibrary.org/search.json"
+SEARCH_FIELDS = "key,title,author_name,first_publish_year,cover_i,subject,edition_count"
+
+
+class _OpenLibraryBase:
+    """URLs and response parsing shared by the sync and async clients."""
+    BASE_URL = "https://openlibrary.org"
     COVER_BASE = "https://covers.openlibrary.org/b/id"
 
-    def search_books(self, query, limit=20):
-        """Search Open Library for books by title/author. Returns list of book dicts."""
-        resp = requests.get(self.SEARCH_URL, params={
-            "q": query,
-            "limit": limit,
-            "fields": "key,title,author_name,first_publish_year,cover_i,subject,edition_count",
-        }, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+    def __init__(self, base_url=None):
+        # OPENLIBRARY_BASE_URL lets load tests point the client at a local stub
+        self.base_url = base_url or os.environ.get("OPENLIBRARY_BASE_URL", self.BASE_URL)
+
+    @property
+    def search_url(self):
+        return f"{self.base_url}/search.json"
+
+    def _search_params(self, query, limit):
+        return {"q": query, "limit": limit, "fields": SEARCH_FIELDS}
 
+    @staticmethod
+    def _author_keys(data):
+        keys = []
+        for author_ref in data.get("authors", []):
+            author_obj = author_ref.get("author", author_ref)
+            author_key = author_obj.get("key", "")
+            if author_key:
+                keys.append(author_key)
+        return keys
+
+    def _parse_search(self, data):
         books = []
         for doc in data.get("docs", []):
             cover_i = doc.get("cover_i")
@@ -33,28 +55,7 @@ class OpenLibraryClient:
             })
         return books
 
-    def get_book_by_id(self, work_id):
-        """Fetch a single book by Open Library work key."""
-        url = f"https://openlibrary.org/works/{work_id}.json"
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Get author names
-        authors = []
-        for author_ref in data.get("authors", []):
-            author_obj = author_ref.get("author", author_ref)
-            author_key = author_obj.get("key", "")
-            if author_key:
-                try:
-                    a_resp = requests.get(f"https://openlibrary.org{author_key}.json", timeout=5)
-                    if a_resp.ok:
-                        authors.append(a_resp.json().get("name", "Unknown"))
-                except Exception:
-                    pass
-
+    def _parse_work(self, work_id, data, authors):
         covers = data.get("covers", [])
         cover_id = covers[0] if covers else None
         subjects = data.get("subjects", [])[:3]
@@ -72,3 +73,73 @@ class OpenLibraryClient:
             "genres": ", ".join(subjects),
             "summary": description[:300] if description else "",
         }
+
+
+class OpenLibraryClient(_OpenLibraryBase):
+
+    def search_books(self, query, limit=20):
+        """Search Open Library for books by title/author. Returns list of book dicts."""
+        resp = requests.get(self.search_url, params=self._search_params(query, limit), timeout=10)
+        resp.raise_for_status()
+        return self._parse_search(resp.json())
+
+    def get_book_by_id(self, work_id):
+        """Fetch a single book by Open Library work key."""
+        url = f"{self.base_url}/works/{work_id}.json"
+        resp = requests.get(url, timeout=10)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        data = resp.json()
+
+        # Get author names
+        authors = []
+        for author_key in self._author_keys(data):
+            try:
+                a_resp = requests.get(f"{self.base_url}{author_key}.json", timeout=5)
+                if a_resp.ok:
+                    authors.append(a_resp.json().get("name", "Unknown"))
+            except Exception:
+                pass
+
+        return self._parse_work(work_id, data, authors)
+
+
+class AsyncOpenLibraryClient(_OpenLibraryBase):
+    """Non-blocking Open Library client (requires httpx); same results as OpenLibraryClient."""
+
+    def __init__(self, base_url=None):
+        if httpx is None:
+            raise RuntimeError("AsyncOpenLibraryClient requires httpx (pip install httpx).")
+        super().__init__(base_url)
+        self._http = httpx.AsyncClient(timeout=10)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def search_books(self, query, limit=20):
+        """Search Open Library for books by title/author. Returns list of book dicts."""
+        resp = await self._http.get(self.search_url, params=self._search_params(query, limit))
+        resp.raise_for_status()
+        return self._parse_search(resp.json())
+
+    async def _author_name(self, author_key):
+        try:
+            a_resp = await self._http.get(f"{self.base_url}{author_key}.json", timeout=5)
+            if a_resp.is_success:
+                return a_resp.json().get("name", "Unknown")
+        except Exception:
+            pass
+        return None
+
+    async def get_book_by_id(self, work_id):
+        """Fetch a single book by Open Library work key."""
+        resp = await self._http.get(f"{self.base_url}/works/{work_id}.json")
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        data = resp.json()
+
+        # Author lookups run concurrently rather than one after another
+        names = await asyncio.gather(*(self._author_name(k) for k in self._author_keys(data)))
+        return self._parse_work(work_id, data, [n for n in names if n])
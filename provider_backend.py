@@ -0,0 +1,231 @@
+"""Pluggable provider backend: live, record, or replay.
+
+Selected with environment variables so the app, the CLI and load tests all
+pick it up without code changes:
+
+    GELI_PROVIDER_BACKEND   live (default) | record | replay
+    GELI_PROVIDER_STORE     response store path (default: providers.db)
+    GELI_REPLAY_LATENCY_MS  mean latency injected per replayed call (default 0)
+    GELI_REPLAY_JITTER_MS   ± uniform jitter around that mean (default 0)
+    GELI_REPLAY_ERROR_RATE  fraction of replayed calls that fail (default 0)
+    GELI_REPLAY_SEED        seed for latency/error draws (default 0)
+    GELI_REPLAY_STRICT      1 to raise ReplayMiss on an unrecorded call (default 0)
+
+In record mode, every search_* / get_*_by_id call on the live client is
+written to the store. Replay mode answers the same calls from the store
+without network access or credentials. A miss returns an empty search
+result or None, the same as a live lookup that found nothing, unless
+GELI_REPLAY_STRICT is set — use it for offline tests so a wrong store or
+unrecorded query fails loudly instead of replaying as fast empty results.
+"""
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+DEFAULT_STORE = os.path.join(os.path.dirname(__file__), "providers.db")
+
+
+class ReplayError(RuntimeError):
+    """Injected provider failure during replay."""
+
+
+class ReplayMiss(LookupError):
+    """Strict replay was asked for a call the store has no recording of."""
+
+
+def _is_provider_call(name):
+    return name.startswith("search_") or (name.startswith("get_") and name.endswith("_by_id"))
+
+
+def _key(media_type, method, args, kwargs):
+    return json.dumps([media_type, method, list(args), kwargs], sort_keys=True, default=str)
+
+
+class ResponseStore:
+    """Provider responses in a SQLite file, zlib-compressed JSON per call."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self):
+        # sqlite3 connections can't be shared across threads; keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Return (found, value) for a recorded call."""
+        row = self._conn().execute("SELECT body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(zlib.decompress(row[0]))
+
+    def recorded_calls(self):
+        """Yield (media_type, method, args, kwargs) for every recorded call."""
+        for (key,) in self._conn().execute("SELECT key FROM responses ORDER BY key"):
+            yield tuple(json.loads(key))
+
+    def put(self, key, value):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body) VALUES (?, ?)",
+            (key, zlib.compress(json.dumps(value).encode())),
+        )
+        conn.commit()
+
+
+class _Injector:
+    """Seeded latency and error draws shared by the replay clients."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self):
+        """Return (delay_seconds, should_fail) for one call."""
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+            fail = self._rng.random() < self.error_rate
+        return max(0.0, self.latency_ms + jitter) / 1000, fail
+
+
+def _replayed(store, media_type, method, args, kwargs, strict):
+    found, value = store.get(_key(media_type, method, args, kwargs))
+    if found:
+        return value
+    if strict:
+        raise ReplayMiss(f"No recorded {media_type} {method} call for {args!r} {kwargs!r} in {store.path}")
+    return [] if method.startswith("search_") else None
+
+
+class RecordingClient:
+    """Wraps a live client and records its provider calls to a store."""
+
+    def __init__(self, inner, store, media_type):
+        self._inner = inner
+        self._store = store
+        self._media_type = media_type
+
+    def __getattr__(self, name):
+        attr = getattr(self._inner, name)
+        if not _is_provider_call(name):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            self._store.put(_key(self._media_type, name, args, kwargs), result)
+            return result
+        return call
+
+
+class ReplayClient:
+    """Answers provider calls from a store with injected latency and errors."""
+
+    def __init__(self, store, media_type, injector, strict=False):
+        self._store = store
+        self._media_type = media_type
+        self._injector = injector
+        self._strict = strict
+
+    def __getattr__(self, name):
+        if not _is_provider_call(name):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            delay, fail = self._injector.draw()
+            time.sleep(delay)
+            if fail:
+                raise ReplayError(f"Injected {self._media_type} provider error")
+            return _replayed(self._store, self._media_type, name, args, kwargs, self._strict)
+        return call
+
+
+class AsyncRecordingClient(RecordingClient):
+    """RecordingClient for the async provider clients."""
+
+    def __getattr__(self, name):
+        attr = getattr(self._inner, name)
+        if not _is_provider_call(name):
+            return attr
+
+        async def call(*args, **kwargs):
+            result = await attr(*args, **kwargs)
+            self._store.put(_key(self._media_type, name, args, kwargs), result)
+            return result
+        return call
+
+
+class AsyncReplayClient(ReplayClient):
+    """ReplayClient for the async search path; latency doesn't block the loop."""
+
+    def __getattr__(self, name):
+        if not _is_provider_call(name):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            delay, fail = self._injector.draw()
+            await asyncio.sleep(delay)
+            if fail:
+                raise ReplayError(f"Injected {self._media_type} provider error")
+            return _replayed(self._store, self._media_type, name, args, kwargs, self._strict)
+        return call
+
+    async def aclose(self):
+        pass
+
+
+# ─── Backend selection ───────────────────────────────────────────────────────
+_stores = {}
+_injector = None
+
+
+def _get_store():
+    path = os.environ.get("GELI_PROVIDER_STORE", DEFAULT_STORE)
+    if path not in _stores:
+        _stores[path] = ResponseStore(path)
+    return _stores[path]
+
+
+def _get_injector():
+    global _injector
+    if _injector is None:
+        _injector = _Injector(
+            latency_ms=float(os.environ.get("GELI_REPLAY_LATENCY_MS", 0)),
+            jitter_ms=float(os.environ.get("GELI_REPLAY_JITTER_MS", 0)),
+            error_rate=float(os.environ.get("GELI_REPLAY_ERROR_RATE", 0)),
+            seed=int(os.environ.get("GELI_REPLAY_SEED", 0)),
+        )
+    return _injector
+
+
+def client_for(media_type, live_factory, asynchronous=False):
+    """Build the provider client for a media type under the configured backend.
+    live_factory(media_type) creates the real client; replay never calls it.
+    """
+    backend = os.environ.get("GELI_PROVIDER_BACKEND", "live")
+    if backend == "live":
+        return live_factory(media_type)
+    if backend == "record":
+        cls = AsyncRecordingClient if asynchronous else RecordingClient
+        return cls(live_factory(media_type), _get_store(), media_type)
+    if backend == "replay":
+        cls = AsyncReplayClient if asynchronous else ReplayClient
+        strict = os.environ.get("GELI_REPLAY_STRICT", "0") not in ("", "0")
+        return cls(_get_store(), media_type, _get_injector(), strict)
+    raise RuntimeError(f"Unknown GELI_PROVIDER_BACKEND: {backend!r} (expected live, record or replay)")
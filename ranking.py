@@ -1,4 +1,7 @@
 """Ranking algorithm for Geli — binary insertion via pairwise comparison + tier-based scoring."""
+import heapq
+from itertools import groupby, islice
+
 import models
 
 
@@ -24,11 +27,12 @@ def get_comparison_state(media_type, tier):
     }
 
 
-def get_comparison_target(media_type, tier, low, high):
+def get_comparison_target(media_type, tier, low, high, step=None):
     """Return the item at the midpoint of [low, high] for the next comparison.
-    Returns (mid_position, item_dict).
+    While galloping (step is set, see next_gallop_step) the probe is at
+    low + step - 1 instead. Returns (mid_position, item_dict).
     """
-    mid = (low + high) // 2
+    mid = (low + high) // 2 if step is None else min(low + step - 1, high)
     item = models.get_item_at_rank(media_type, tier, mid)
     return mid, item
 
@@ -59,10 +63,137 @@ def process_comparison(answer, low, high, mid):
         return new_low, new_high, None
 
 
+def next_gallop_step(answer, step):
+    """Advance a galloping search (exponential search from the low bound).
+
+    The probe distance doubles each time the new item loses; its first win
+    brackets the insertion point, and the search continues as a plain binary
+    search (None) within that bracket. Finding a spot d places past low takes
+    about 2·log2(d) comparisons, however long the rest of the range is.
+    """
+    if step is None or answer == "better":
+        return None
+    return step * 2
+
+
 def insert_item(item_data, media_type, tier, position):
     """Insert an item at the given position in the tier, shifting others down."""
-    models.shift_ranks_down(media_type, tier, position)
-    models.add_item(item_data, media_type, tier, position)
+    models.insert_item(item_data, media_type, tier, position)
+
+
+def move_item(media_type, external_id, tier, position):
+    """Move an already-ranked item to a position in a tier, in one transaction."""
+    return models.move_item(media_type, external_id, tier, position)
+
+
+# ─── Bulk import planning ────────────────────────────────────────────────────
+
+def tier_for_rating(rating, scale=5):
+    """Map an external star rating on a 0..scale range to a tier."""
+    score = rating / scale * 10
+    for tier in ("like", "neutral"):
+        if score >= TIER_RANGES[tier][0]:
+            return tier
+    return "dislike"
+
+
+def plan_import(media_type, entries, scale=5):
+    """Pre-order rated entries and decide which of them still need comparisons.
+
+    entries is a list of {"item_data", "rating"}. Within a tier, a strictly
+    higher rating already fixes the relative order, so only two things are
+    ambiguous: ties, and placement among items already in the tier (which
+    carry no rating). An empty tier takes the first item of each rating group
+    directly; everything else is queued with anchors that restrict its
+    search to the slots its rating allows.
+
+    Queued entries are placed in queue order, best rating first, and each
+    one's lower anchor is where the previous rating group landed. Their
+    searches gallop forward from that point (next_gallop_step) rather than
+    bisecting the whole rest of the tier, so the import costs comparisons in
+    proportion to how far apart neighbouring imports land — a merge of two
+    sorted lists — instead of one full binary search per item.
+
+    Returns (appends, pending) for models.import_items.
+    """
+    by_tier = {}
+    for entry in entries:
+        by_tier.setdefault(tier_for_rating(entry["rating"], scale), []).append(entry)
+
+    appends, pending = {}, []
+    for tier in TIER_RANGES:
+        tier_entries = by_tier.get(tier)
+        if not tier_entries:
+            continue
+        # sorted() is stable, so ties keep their export order as a first guess.
+        tier_entries = sorted(tier_entries, key=lambda e: -e["rating"])
+        groups = [list(g) for _, g in groupby(tier_entries, key=lambda e: e["rating"])]
+        tier_empty = models.count_items_in_tier(media_type, tier) == 0
+
+        better_ids = []
+        for i, group in enumerate(groups):
+            if tier_empty:
+                appends.setdefault(tier, []).append(group[0]["item_data"])
+                queued = group[1:]
+                worse_ids = [str(groups[i + 1][0]["item_data"]["external_id"])] if i + 1 < len(groups) else []
+            else:
+                queued = group
+                worse_ids = []
+            for entry in queued:
+                pending.append({
+                    "item_data": entry["item_data"],
+                    "tier": tier,
+                    "after": better_ids,
+                    "before": worse_ids,
+                })
+            better_ids = [str(e["item_data"]["external_id"]) for e in group]
+
+    return appends, pending
+
+
+def get_pending_bounds(media_type, entry):
+    """Resolve a queued import entry's anchors to (low, high) search bounds.
+    low > high means the position is already determined (insert at low).
+    """
+    tier = entry["tier"]
+    positions = models.get_rank_positions(media_type, tier, entry["after"] + entry["before"])
+    low = max((positions[i] for i in entry["after"] if i in positions), default=0) + 1
+    high = min(
+        (positions[i] for i in entry["before"] if i in positions),
+        default=models.count_items_in_tier(media_type, tier) + 1,
+    ) - 1
+    return low, high
+
+
+def next_pending_comparison(media_type):
+    """Place queued imports that need no comparison and return the first that does.
+    Returns (entry, low, high), or None once the queue is drained.
+    """
+    while True:
+        entry = models.get_next_pending_import(media_type)
+        if entry is None:
+            return None
+        if models.item_exists(media_type, entry["item_data"]["external_id"]):
+            models.delete_pending_import(media_type, entry["id"])
+            continue
+        low, high = get_pending_bounds(media_type, entry)
+        if low <= high:
+            return entry, low, high
+        insert_item(entry["item_data"], media_type, entry["tier"], low)
+        models.delete_pending_import(media_type, entry["id"])
+
+
+def score_for(tier, rank_position, tier_count):
+    """Score of the item at rank_position in a tier holding tier_count items."""
+    score_min, score_max = TIER_RANGES[tier]
+    if tier_count == 1:
+        # Only item in tier gets midpoint
+        return round((score_min + score_max) / 2, 1)
+    # Position 1 = best = max score, last position = min score
+    return round(
+        score_max - ((rank_position - 1) / (tier_count - 1)) * (score_max - score_min),
+        1,
+    )
 
 
 def calculate_scores(items_list):
@@ -76,22 +207,55 @@ def calculate_scores(items_list):
     if total < 10:
         return items_list  # No scores yet
 
+    tier_counts = {}
+    for item in items_list:
+        tier_counts[item["tier"]] = tier_counts.get(item["tier"], 0) + 1
+
     for item in items_list:
-        tier = item["tier"]
-        score_min, score_max = TIER_RANGES[tier]
-        # Get all items in this tier to know count
-        tier_items = [i for i in items_list if i["tier"] == tier]
-        tier_count = len(tier_items)
-
-        if tier_count == 1:
-            # Only item in tier gets midpoint
-            item["score"] = round((score_min + score_max) / 2, 1)
-        else:
-            # Position 1 = best = max score, last position = min score
-            rank = item["rank_position"]
-            item["score"] = round(
-                score_max - ((rank - 1) / (tier_count - 1)) * (score_max - score_min),
-                1,
-            )
+        item["score"] = score_for(item["tier"], item["rank_position"], tier_counts[item["tier"]])
 
     return items_list
+
+
+def iter_scored_items(media_type, limit=None, tier_counts=None):
+    """Stream a media type's items in rank order with scores computed on the fly.
+
+    Only the per-tier counts are read up front (pass tier_counts if they're
+    already known); each row is scored as it comes off the cursor. score is
+    None while fewer than 10 items are ranked.
+    """
+    if tier_counts is None:
+        tier_counts = models.count_items_by_tier(media_type)
+    show_scores = sum(tier_counts.values()) >= 10
+    for item in models.iter_ranked_items(media_type, limit):
+        item["score"] = (
+            score_for(item["tier"], item["rank_position"], tier_counts.get(item["tier"], 1))
+            if show_scores else None
+        )
+        yield item
+
+
+def iter_leaderboard(limit=None):
+    """Stream items from every media type in one list, best score first.
+
+    Each media type's rank order is already descending by score (tier ranges
+    don't overlap and rank 1 scores highest), so a heap merge of the
+    per-media streams yields the global order while holding one row per
+    stream. With a limit, no stream can contribute more than `limit` rows,
+    so each one reads at most that many off the tier/rank index. The tier
+    counts come from one grouped query per media type on the same index.
+    Media types with fewer than 10 items have no scores and are left out.
+    """
+    streams = []
+    for media_type in sorted(models.VALID_MEDIA_TYPES):
+        tier_counts = models.count_items_by_tier(media_type)
+        if sum(tier_counts.values()) < 10:
+            continue
+        streams.append(iter_scored_items(media_type, limit, tier_counts))
+
+    merged = heapq.merge(*streams, key=lambda item: -item["score"])
+    try:
+        yield from islice(merged, limit)
+    finally:
+        for stream in streams:
+            stream.close()
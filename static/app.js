@@ -35,6 +35,80 @@ if (mediaToggle && mediaDropdown) {
 
 // ── Search Page Logic ────────────────────────────────
 
+// Recent results per query, most recently used last. Keys include the media
+// type so switching categories never shows the wrong kind of item.
+const SEARCH_CACHE_SIZE = 50;
+const searchCache = new Map();
+let searchController = null;
+
+function searchCacheKey(query) {
+    return `${mediaType}:${query.toLowerCase()}`;
+}
+
+function searchCacheGet(query) {
+    const key = searchCacheKey(query);
+    if (!searchCache.has(key)) return null;
+    const items = searchCache.get(key);
+    searchCache.delete(key);
+    searchCache.set(key, items);
+    return items;
+}
+
+function searchCachePut(query, items) {
+    const key = searchCacheKey(query);
+    searchCache.delete(key);
+    searchCache.set(key, items);
+    if (searchCache.size > SEARCH_CACHE_SIZE) {
+        searchCache.delete(searchCache.keys().next().value);
+    }
+}
+
+// Results of the longest cached prefix of query ("zeld" while typing "zelda"),
+// narrowed locally to items that still match every word.
+function filterBroaderResults(query) {
+    const terms = query.toLowerCase().split(/\s+/).filter(Boolean);
+    for (let len = query.length - 1; len >= 2; len--) {
+        const broader = searchCache.get(searchCacheKey(query.slice(0, len)));
+        if (!broader) continue;
+        return broader.filter(item => {
+            const text = `${item.name} ${item.meta_line || ''}`.toLowerCase();
+            return terms.every(term => text.includes(term));
+        });
+    }
+    return null;
+}
+
+function renderSearchResults(resultsDiv, items) {
+    if (items.length === 0) {
+        resultsDiv.innerHTML = '<div class="no-results">No results found. Try a different search.</div>';
+        return;
+    }
+
+    const emoji = MEDIA_EMOJI[mediaType] || '🎮';
+
+    resultsDiv.innerHTML = items.map(item => `
+        <div class="search-result-card ${item.already_ranked ? 'already-ranked' : ''}"
+             onclick="${item.already_ranked ? '' : `openRatingModal(${escapeAttr(JSON.stringify(item))})`}">
+            <div class="search-result-cover">
+                ${item.cover_url
+            ? `<img src="${item.cover_url}" alt="${escapeHtml(item.name)}" loading="lazy">`
+            : `<div class="no-cover">${emoji}</div>`}
+            </div>
+            <div class="search-result-info">
+                <div class="search-result-title">${escapeHtml(item.name)}</div>
+                <div class="search-result-meta">
+                    ${item.release_year ? item.release_year : ''}
+                    ${item.meta_line ? ' · ' + escapeHtml(item.meta_line) : ''}
+                    ${item.genres ? ' · ' + escapeHtml(item.genres) : ''}
+                </div>
+            </div>
+            ${item.already_ranked
+            ? '<span class="search-result-badge">Already Ranked</span>'
+            : '<span class="search-result-badge">+ Rate</span>'}
+        </div>
+    `).join('');
+}
+
 const searchInput = document.getElementById('searchInput');
 if (searchInput) {
     searchInput.addEventListener('input', function () {
@@ -43,18 +117,42 @@ if (searchInput) {
         const spinner = document.getElementById('searchSpinner');
         const resultsDiv = document.getElementById('searchResults');
 
+        // Whatever is in flight is for an older query now
+        if (searchController) {
+            searchController.abort();
+            searchController = null;
+        }
+
         if (query.length < 2) {
             resultsDiv.innerHTML = '';
             spinner.classList.remove('active');
             return;
         }
 
+        const cached = searchCacheGet(query);
+        if (cached) {
+            spinner.classList.remove('active');
+            renderSearchResults(resultsDiv, cached);
+            return;
+        }
+
+        // Show a narrowed copy of a broader query's results while the exact one loads
+        const provisional = filterBroaderResults(query);
+        if (provisional && provisional.length > 0) {
+            renderSearchResults(resultsDiv, provisional);
+        }
+
         spinner.classList.add('active');
 
         searchTimeout = setTimeout(async () => {
+            const controller = new AbortController();
+            searchController = controller;
             try {
-                const resp = await fetch(`/${mediaType}/api/search?q=${encodeURIComponent(query)}`);
+                const resp = await fetch(`/${mediaType}/api/search?q=${encodeURIComponent(query)}`,
+                    { signal: controller.signal });
                 const items = await resp.json();
+                if (controller.signal.aborted) return;
+                searchController = null;
                 spinner.classList.remove('active');
 
                 if (items.error) {
@@ -62,35 +160,11 @@ if (searchInput) {
                     return;
                 }
 
-                if (items.length === 0) {
-                    resultsDiv.innerHTML = '<div class="no-results">No results found. Try a different search.</div>';
-                    return;
-                }
-
-                const emoji = MEDIA_EMOJI[mediaType] || '🎮';
-
-                resultsDiv.innerHTML = items.map(item => `
-                    <div class="search-result-card ${item.already_ranked ? 'already-ranked' : ''}"
-                         onclick="${item.already_ranked ? '' : `openRatingModal(${escapeAttr(JSON.stringify(item))})`}">
-                        <div class="search-result-cover">
-                            ${item.cover_url
-                        ? `<img src="${item.cover_url}" alt="${escapeHtml(item.name)}" loading="lazy">`
-                        : `<div class="no-cover">${emoji}</div>`}
-                        </div>
-                        <div class="search-result-info">
-                            <div class="search-result-title">${escapeHtml(item.name)}</div>
-                            <div class="search-result-meta">
-                                ${item.release_year ? item.release_year : ''}
-                                ${item.meta_line ? ' · ' + escapeHtml(item.meta_line) : ''}
-                                ${item.genres ? ' · ' + escapeHtml(item.genres) : ''}
-                            </div>
-                        </div>
-                        ${item.already_ranked
-                        ? '<span class="search-result-badge">Already Ranked</span>'
-                        : '<span class="search-result-badge">+ Rate</span>'}
-                    </div>
-                `).join('');
+                searchCachePut(query, items);
+                renderSearchResults(resultsDiv, items);
             } catch (err) {
+                if (err.name === 'AbortError') return;
+                searchController = null;
                 spinner.classList.remove('active');
                 resultsDiv.innerHTML = `<div class="no-results">Search failed. Please try again.</div>`;
             }
@@ -3,8 +3,25 @@ import json
 import os
 import requests
 
+try:
+    import httpx
+except ImportError:  # only needed by AsyncTMDBClient
+    httpx = None
 
-class TMDBClient:
+
+def _release_year(date_str):
+    if date_str and len(date_str) >= 4:
+        return int(date_str[:4])
+    return None
+
+
+def _genre_names(genre_ids, mapping):
+    """Convert list of genre IDs to comma-separated names."""
+    return ", ".join(mapping.get(gid, "") for gid in genre_ids if mapping.get(gid))
+
+
+class _TMDBBase:
+    """Credentials and response parsing shared by the sync and async clients."""
     API_BASE = "https://api.themoviedb.org/3"
     IMAGE_BASE = "https://image.tmdb.org/t/p/w300"
 
@@ -29,6 +46,54 @@ class TMDBClient:
         self._genre_cache_movie = {}
         self._genre_cache_tv = {}
 
+    def _cached_genres(self, media):
+        return self._genre_cache_movie if media == "movie" else self._genre_cache_tv
+
+    def _store_genres(self, media, data):
+        mapping = {g["id"]: g["name"] for g in data.get("genres", [])}
+        if media == "movie":
+            self._genre_cache_movie = mapping
+        else:
+            self._genre_cache_tv = mapping
+        return mapping
+
+    def _cover_url(self, poster_path):
+        return f"{self.IMAGE_BASE}{poster_path}" if poster_path else None
+
+    def _parse_search(self, data, media, genres, limit):
+        """Parse a search/movie or search/tv response."""
+        title_key, date_key = ("title", "release_date") if media == "movie" else ("name", "first_air_date")
+        results = []
+        for r in data.get("results", [])[:limit]:
+            names = _genre_names(r.get("genre_ids", []), genres)
+            results.append({
+                "external_id": r["id"],
+                "name": r.get(title_key, "Unknown"),
+                "cover_url": self._cover_url(r.get("poster_path")),
+                "release_year": _release_year(r.get(date_key, "")),
+                "meta_line": names,
+                "genres": names,
+                "summary": r.get("overview", ""),
+            })
+        return results
+
+    def _parse_detail(self, r, media):
+        """Parse a movie/{id} or tv/{id} response."""
+        title_key, date_key = ("title", "release_date") if media == "movie" else ("name", "first_air_date")
+        genres = ", ".join(g["name"] for g in r.get("genres", []))
+        return {
+            "external_id": r["id"],
+            "name": r.get(title_key, "Unknown"),
+            "cover_url": self._cover_url(r.get("poster_path")),
+            "release_year": _release_year(r.get(date_key, "")),
+            "meta_line": genres,
+            "genres": genres,
+            "summary": r.get("overview", ""),
+        }
+
+
+class TMDBClient(_TMDBBase):
+
     def _get(self, endpoint, params=None):
         """Make a GET request to the TMDB API."""
         url = f"{self.API_BASE}/{endpoint}"
@@ -41,46 +106,17 @@ class TMDBClient:
 
     def _load_genres(self, media):
         """Load and cache genre ID → name mapping."""
-        cache = self._genre_cache_movie if media == "movie" else self._genre_cache_tv
+        cache = self._cached_genres(media)
         if cache:
             return cache
-        data = self._get(f"genre/{media}/list")
-        mapping = {g["id"]: g["name"] for g in data.get("genres", [])}
-        if media == "movie":
-            self._genre_cache_movie = mapping
-        else:
-            self._genre_cache_tv = mapping
-        return mapping
-
-    def _genre_names(self, genre_ids, media):
-        """Convert list of genre IDs to comma-separated names."""
-        mapping = self._load_genres(media)
-        return ", ".join(mapping.get(gid, "") for gid in genre_ids if mapping.get(gid))
+        return self._store_genres(media, self._get(f"genre/{media}/list"))
 
     # ── Movies ────────────────────────────────────────────────────
 
     def search_movies(self, query, limit=20):
         """Search TMDB for movies. Returns list of movie dicts."""
         data = self._get("search/movie", {"query": query})
-        results = data.get("results", [])[:limit]
-
-        movies = []
-        for m in results:
-            release_year = None
-            rd = m.get("release_date", "")
-            if rd and len(rd) >= 4:
-                release_year = int(rd[:4])
-
-            movies.append({
-                "external_id": m["id"],
-                "name": m.get("title", "Unknown"),
-                "cover_url": f"{self.IMAGE_BASE}{m['poster_path']}" if m.get("poster_path") else None,
-                "release_year": release_year,
-                "meta_line": self._genre_names(m.get("genre_ids", []), "movie"),
-                "genres": self._genre_names(m.get("genre_ids", []), "movie"),
-                "summary": m.get("overview", ""),
-            })
-        return movies
+        return self._parse_search(data, "movie", self._load_genres("movie"), limit)
 
     def get_movie_by_id(self, movie_id):
         """Fetch a single movie by TMDB ID."""
@@ -88,48 +124,14 @@ class TMDBClient:
             m = self._get(f"movie/{movie_id}")
         except Exception:
             return None
-
-        release_year = None
-        rd = m.get("release_date", "")
-        if rd and len(rd) >= 4:
-            release_year = int(rd[:4])
-
-        genres = ", ".join(g["name"] for g in m.get("genres", []))
-
-        return {
-            "external_id": m["id"],
-            "name": m.get("title", "Unknown"),
-            "cover_url": f"{self.IMAGE_BASE}{m['poster_path']}" if m.get("poster_path") else None,
-            "release_year": release_year,
-            "meta_line": genres,
-            "genres": genres,
-            "summary": m.get("overview", ""),
-        }
+        return self._parse_detail(m, "movie")
 
     # ── TV Shows ──────────────────────────────────────────────────
 
     def search_tv(self, query, limit=20):
         """Search TMDB for TV shows. Returns list of show dicts."""
         data = self._get("search/tv", {"query": query})
-        results = data.get("results", [])[:limit]
-
-        shows = []
-        for s in results:
-            release_year = None
-            rd = s.get("first_air_date", "")
-            if rd and len(rd) >= 4:
-                release_year = int(rd[:4])
-
-            shows.append({
-                "external_id": s["id"],
-                "name": s.get("name", "Unknown"),
-                "cover_url": f"{self.IMAGE_BASE}{s['poster_path']}" if s.get("poster_path") else None,
-                "release_year": release_year,
-                "meta_line": self._genre_names(s.get("genre_ids", []), "tv"),
-                "genres": self._genre_names(s.get("genre_ids", []), "tv"),
-                "summary": s.get("overview", ""),
-            })
-        return shows
+        return self._parse_search(data, "tv", self._load_genres("tv"), limit)
 
     def get_tv_by_id(self, tv_id):
         """Fetch a single TV show by TMDB ID."""
@@ -137,20 +139,64 @@ class TMDBClient:
             s = self._get(f"tv/{tv_id}")
         except Exception:
             return None
+        return self._parse_detail(s, "tv")
 
-        release_year = None
-        rd = s.get("first_air_date", "")
-        if rd and len(rd) >= 4:
-            release_year = int(rd[:4])
 
-        genres = ", ".join(g["name"] for g in s.get("genres", []))
+class AsyncTMDBClient(_TMDBBase):
+    """Non-blocking TMDB client (requires httpx); same results as TMDBClient."""
 
-        return {
-            "external_id": s["id"],
-            "name": s.get("name", "Unknown"),
-            "cover_url": f"{self.IMAGE_BASE}{s['poster_path']}" if s.get("poster_path") else None,
-            "release_year": release_year,
-            "meta_line": genres,
-            "genres": genres,
-            "summary": s.get("overview", ""),
-        }
+    def __init__(self, creds_path="creds.json"):
+        if httpx is None:
+            raise RuntimeError("AsyncTMDBClient requires httpx (pip install httpx).")
+        super().__init__(creds_path)
+        self._http = httpx.AsyncClient(timeout=10)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _get(self, endpoint, params=None):
+        """Make a GET request to the TMDB API."""
+        url = f"{self.API_BASE}/{endpoint}"
+        if params is None:
+            params = {}
+        params["api_key"] = self.api_key
+        resp = await self._http.get(url, params=params)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _load_genres(self, media):
+        """Load and cache genre ID → name mapping."""
+        cache = self._cached_genres(media)
+        if cache:
+            return cache
+        return self._store_genres(media, await self._get(f"genre/{media}/list"))
+
+    # ── Movies ────────────────────────────────────────────────────
+
+    async def search_movies(self, query, limit=20):
+        """Search TMDB for movies. Returns list of movie dicts."""
+        data = await self._get("search/movie", {"query": query})
+        return self._parse_search(data, "movie", await self._load_genres("movie"), limit)
+
+    async def get_movie_by_id(self, movie_id):
+        """Fetch a single movie by TMDB ID."""
+        try:
+            m = await self._get(f"movie/{movie_id}")
+        except Exception:
+            return None
+        return self._parse_detail(m, "movie")
+
+    # ── TV Shows ──────────────────────────────────────────────────
+
+    async def search_tv(self, query, limit=20):
+        """Search TMDB for TV shows. Returns list of show dicts."""
+        data = await self._get("search/tv", {"query": query})
+        return self._parse_search(data, "tv", await self._load_genres("tv"), limit)
+
+    async def get_tv_by_id(self, tv_id):
+        """Fetch a single TV show by TMDB ID."""
+        try:
+            s = await self._get(f"tv/{tv_id}")
+        except Exception:
+            return None
+        return self._parse_detail(s, "tv")